@@ -758,7 +758,7 @@ def extract_content_string(content):
     else:
         return str(content)
 
-def run_analysis():
+def run_analysis(resume=False):
     # First get all user selections
     selections = get_user_selections()
 
@@ -770,6 +770,8 @@ def run_analysis():
     config["deep_think_llm"] = selections["deep_thinker"]
     config["backend_url"] = selections["backend_url"]
     config["llm_provider"] = selections["llm_provider"].lower()
+    # checkpointed so that a failed run can be continued with --resume
+    config["checkpoint_runs"] = True
 
     # Initialize the graph
     graph = TradingAgentsGraph(
@@ -862,11 +864,14 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"]
+        # Initialize state and get graph args, continuing an unfinished run if asked to
+        init_agent_state, args = graph.run_inputs(
+            selections["ticker"], selections["analysis_date"], resume
         )
-        args = graph.propagator.get_graph_args()
+        if init_agent_state is None:
+            message_buffer.add_message(
+                "System", "Resuming the unfinished run from its last checkpoint"
+            )
 
         # Stream the analysis
         trace = []
@@ -1124,8 +1129,147 @@ def run_analysis():
 
 
 @app.command()
-def analyze():
-    run_analysis()
+def analyze(
+    resume: bool = typer.Option(
+        False, "--resume/--fresh", help="Continue an unfinished run of the same ticker, date and settings instead of starting over"
+    ),
+):
+    run_analysis(resume)
+
+
+@app.command()
+def warmup(
+    tickers: str = typer.Option(..., "--tickers", help="Comma-separated watchlist, e.g. SPY,AAPL,0700.HK"),
+    date: Optional[str] = typer.Option(None, "--date", help="Analysis date, YYYY-MM-DD (default: today)"),
+    online: Optional[bool] = typer.Option(
+        None, "--online/--offline", help="Warm online or offline sources (default: config online_tools)"
+    ),
+    sources: Optional[str] = typer.Option(
+        None, "--sources", help="Comma-separated sources to warm (default: all free sources)"
+    ),
+    workers: int = typer.Option(8, "--workers", help="Tasks run in parallel"),
+):
+    """Fill the data caches for a watchlist ahead of the day's analyses."""
+    from tradingagents.dataflows.config import set_config
+    from tradingagents.dataflows.warmup import warm_up
+
+    set_config(DEFAULT_CONFIG.copy())
+    date = date or datetime.datetime.now().strftime("%Y-%m-%d")
+    ticker_list = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    source_list = [source.strip() for source in sources.split(",")] if sources else None
+
+    console.print(f"[bold]Warming caches for {', '.join(ticker_list)} on {date}[/bold]")
+    report = warm_up(
+        ticker_list,
+        date,
+        online=online,
+        sources=source_list,
+        max_workers=workers,
+        progress=lambda source, label, error: console.print(
+            f"  {'[red]✗' if error else '[green]✓'}[/] {source}: {label}"
+            + (f" ({error})" if error else "")
+        ),
+    )
+
+    table = Table(title="Warm-up report", box=box.SIMPLE_HEAD)
+    table.add_column("Source")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Task time (s)", justify="right")
+    table.add_column("Done after (s)", justify="right")
+    table.add_column("Failures", justify="right")
+    for source, entry in report.items():
+        table.add_row(
+            source,
+            str(entry["tasks"]),
+            f"{entry['seconds']:.1f}",
+            f"{entry['wall_seconds']:.1f}",
+            str(len(entry["failures"])),
+        )
+    console.print(table)
+
+    failed = sum(len(entry["failures"]) for entry in report.values())
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _read_list(value):
+    """Entries of a file (one per line, # comments) or of a comma-separated list."""
+    if os.path.isfile(value):
+        with open(value, "r", encoding="utf-8") as f:
+            entries = [line.split("#", 1)[0].strip() for line in f]
+    else:
+        entries = [entry.strip() for entry in value.split(",")]
+    return [entry for entry in entries if entry]
+
+
+@app.command()
+def batch(
+    tickers: str = typer.Option(..., "--tickers", help="File with one ticker per line, or a comma-separated list"),
+    dates: str = typer.Option(..., "--dates", help="File with one YYYY-MM-DD date per line, or a comma-separated list"),
+    analysts: str = typer.Option(
+        "market,social,news,fundamentals", "--analysts", help="Comma-separated analysts to run"
+    ),
+    results: Optional[str] = typer.Option(
+        None, "--results", help="JSON lines results file, re-runs resume from it (default: results_dir/batch_results.jsonl)"
+    ),
+    workers: int = typer.Option(4, "--workers", help="Analyses run in parallel"),
+    retries: int = typer.Option(2, "--retries", help="Retries of a failed analysis"),
+):
+    """Analyze every ticker on every date, sharing one graph across the runs."""
+    ticker_list = [ticker.upper() for ticker in _read_list(tickers)]
+    date_list = _read_list(dates)
+    jobs = [(ticker, date) for date in date_list for ticker in ticker_list]
+    results = results or os.path.join(DEFAULT_CONFIG["results_dir"], "batch_results.jsonl")
+
+    graph = TradingAgentsGraph(
+        [analyst.strip() for analyst in analysts.split(",")], config=DEFAULT_CONFIG.copy()
+    )
+
+    console.print(f"[bold]Running {len(jobs)} analyses with {workers} workers, results in {results}[/bold]")
+    failed = 0
+    for result in graph.propagate_many(jobs, max_concurrency=workers, retries=retries, results_path=results):
+        if result["status"] == "ok":
+            note = " (resumed)" if result["resumed"] else f" in {result['seconds']:.0f}s"
+            console.print(f"  [green]✓[/] {result['ticker']} {result['trade_date']}: {result['decision']}{note}")
+        else:
+            failed += 1
+            console.print(
+                f"  [red]✗[/] {result['ticker']} {result['trade_date']}: {result['error']}"
+                f" after {result['attempts']} attempts"
+            )
+
+    console.print(f"[bold]{len(jobs) - failed} of {len(jobs)} analyses done[/bold]")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("invalidate-reports")
+def invalidate_reports(
+    ticker: Optional[str] = typer.Option(None, "--ticker", help="Only drop this ticker's reports"),
+    date: Optional[str] = typer.Option(None, "--date", help="Only drop reports on this date, YYYY-MM-DD"),
+    analysts: Optional[str] = typer.Option(None, "--analysts", help="Only drop these comma-separated analysts' reports"),
+    all_reports: bool = typer.Option(False, "--all", help="Drop every cached report"),
+):
+    """
+    Drop cached analyst reports so the next runs redo them.
+
+    Reports are only cached and reused by runs whose config sets
+    "cache_analyst_reports" to True, which is off by default.
+    """
+    from tradingagents.dataflows.config import set_config
+    from tradingagents.graph.report_cache import get_report_cache
+
+    if not (ticker or date or analysts or all_reports):
+        console.print("[red]Give --ticker, --date or --analysts, or --all to drop every report[/red]")
+        raise typer.Exit(code=2)
+
+    set_config(DEFAULT_CONFIG.copy())
+    dropped = get_report_cache().invalidate(
+        ticker.upper() if ticker else None,
+        date,
+        [analyst.strip() for analyst in analysts.split(",")] if analysts else None,
+    )
+    console.print(f"Dropped {dropped} cached analyst reports")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_llm_node
 
 
 def create_fundamentals_analyst(llm, toolkit):
@@ -51,12 +52,12 @@ def create_fundamentals_analyst(llm, toolkit):
         if ("maas-cn-southwest-2.modelarts-maas.com" in toolkit.config.get("backend_url", "")):
             # 华为云 DeepSeek 不支持标准工具调用，直接使用 LLM
             chain = prompt | llm
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
             # 模拟空的工具调用
             result.tool_calls = []
         else:
             chain = prompt | llm.bind_tools(tools)
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
 
         report = ""
 
@@ -68,4 +69,4 @@ def create_fundamentals_analyst(llm, toolkit):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    return create_llm_node(fundamentals_analyst_node)
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_llm_node
 
 
 def create_market_analyst(llm, toolkit):
@@ -13,11 +14,13 @@ def create_market_analyst(llm, toolkit):
         if toolkit.config["online_tools"]:
             tools = [
                 toolkit.get_YFin_data_online,
+                toolkit.get_stockstats_indicators_table_online,
                 toolkit.get_stockstats_indicators_report_online,
             ]
         else:
             tools = [
                 toolkit.get_YFin_data,
+                toolkit.get_stockstats_indicators_table,
                 toolkit.get_stockstats_indicators_report,
             ]
 
@@ -46,7 +49,7 @@ Volatility Indicators:
 Volume-Based Indicators:
 - vwma: VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses.
 
-- Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Please make sure to call get_YFin_data first to retrieve the CSV that is needed to generate indicators. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."""
+- Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Request all of the indicators you selected together in a single call to the indicators table tool rather than one call per indicator. Please make sure to call get_YFin_data first to retrieve the CSV that is needed to generate indicators. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions."""
             + """ Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."""
         )
 
@@ -76,12 +79,12 @@ Volume-Based Indicators:
         if ("maas-cn-southwest-2.modelarts-maas.com" in toolkit.config.get("backend_url", "")):
             # 华为云 DeepSeek 不支持标准工具调用，直接使用 LLM
             chain = prompt | llm
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
             # 模拟空的工具调用
             result.tool_calls = []
         else:
             chain = prompt | llm.bind_tools(tools)
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
 
         report = ""
 
@@ -93,4 +96,4 @@ Volume-Based Indicators:
             "market_report": report,
         }
 
-    return market_analyst_node
+    return create_llm_node(market_analyst_node)
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_llm_node
 
 
 def create_news_analyst(llm, toolkit):
@@ -48,12 +49,12 @@ def create_news_analyst(llm, toolkit):
         if ("maas-cn-southwest-2.modelarts-maas.com" in toolkit.config.get("backend_url", "")):
             # 华为云 DeepSeek 不支持标准工具调用，直接使用 LLM
             chain = prompt | llm
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
             # 模拟空的工具调用
             result.tool_calls = []
         else:
             chain = prompt | llm.bind_tools(tools)
-            result = chain.invoke(state["messages"])
+            result = yield chain, state["messages"]
 
         report = ""
 
@@ -65,4 +66,4 @@ def create_news_analyst(llm, toolkit):
             "news_report": report,
         }
 
-    return news_analyst_node
+    return create_llm_node(news_analyst_node)
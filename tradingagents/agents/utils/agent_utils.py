@@ -3,7 +3,9 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import tool
+import asyncio
 from datetime import date, timedelta, datetime
 import functools
 import pandas as pd
@@ -11,6 +13,7 @@ import os
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
+import tradingagents.dataflows.vendors as vendors
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
 
@@ -31,6 +34,37 @@ def create_msg_delete():
     return delete_messages
 
 
+def create_llm_node(step):
+    """
+    Turn an agent step into a graph node with sync and async implementations.
+
+    step(state) is a generator that yields one (runnable, input) pair, is sent
+    the runnable's output and returns the state update. The node runs the
+    runnable with invoke under graph.invoke/stream and with ainvoke under
+    graph.ainvoke/astream, where the blocking part of the step before the
+    call (e.g. memory lookups) runs in a worker thread.
+    """
+
+    def finish(steps, response):
+        try:
+            steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+        raise RuntimeError("An agent step must make exactly one LLM call")
+
+    def node(state):
+        steps = step(state)
+        runnable, inputs = next(steps)
+        return finish(steps, runnable.invoke(inputs))
+
+    async def anode(state):
+        steps = step(state)
+        runnable, inputs = await asyncio.to_thread(next, steps)
+        return finish(steps, await runnable.ainvoke(inputs))
+
+    return RunnableLambda(node, afunc=anode, name=getattr(step, "__name__", None))
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -157,7 +191,7 @@ class Toolkit:
             str: A formatted dataframe containing the stock price data for the specified ticker symbol in the specified date range.
         """
 
-        result_data = interface.get_YFin_data_online(symbol, start_date, end_date)
+        result_data = vendors.fetch("prices", symbol, start_date, end_date)
 
         return result_data
 
@@ -219,6 +253,64 @@ class Toolkit:
 
         return result_stockstats
 
+    @staticmethod
+    @tool
+    def get_stockstats_indicators_table(
+        symbol: Annotated[str, "ticker symbol of the company"],
+        indicators: Annotated[
+            List[str], "technical indicators to get the analysis and report of"
+        ],
+        curr_date: Annotated[
+            str, "The current trading date you are trading on, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"] = 30,
+    ) -> str:
+        """
+        Retrieve several stock stats indicators for a given ticker symbol in one call.
+        Args:
+            symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+            indicators (List[str]): Technical indicators to get the analysis and report of, e.g. ["close_50_sma", "rsi", "macd"]
+            curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+            look_back_days (int): How many days to look back, default is 30
+        Returns:
+            str: A table of the requested indicators for each trading day in the window, followed by a description of each indicator.
+        """
+
+        result_stockstats = interface.get_stock_stats_indicators_table(
+            symbol, indicators, curr_date, look_back_days, False
+        )
+
+        return result_stockstats
+
+    @staticmethod
+    @tool
+    def get_stockstats_indicators_table_online(
+        symbol: Annotated[str, "ticker symbol of the company"],
+        indicators: Annotated[
+            List[str], "technical indicators to get the analysis and report of"
+        ],
+        curr_date: Annotated[
+            str, "The current trading date you are trading on, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"] = 30,
+    ) -> str:
+        """
+        Retrieve several stock stats indicators for a given ticker symbol in one call.
+        Args:
+            symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+            indicators (List[str]): Technical indicators to get the analysis and report of, e.g. ["close_50_sma", "rsi", "macd"]
+            curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+            look_back_days (int): How many days to look back, default is 30
+        Returns:
+            str: A table of the requested indicators for each trading day in the window, followed by a description of each indicator.
+        """
+
+        result_stockstats = interface.get_stock_stats_indicators_table(
+            symbol, indicators, curr_date, look_back_days, True
+        )
+
+        return result_stockstats
+
     @staticmethod
     @tool
     def get_finnhub_company_insider_sentiment(
@@ -261,9 +353,7 @@ class Toolkit:
             str: a report of the company's insider transactions/trading information in the past 30 days
         """
 
-        data_trans = interface.get_finnhub_company_insider_transactions(
-            ticker, curr_date, 30
-        )
+        data_trans = vendors.fetch("insider", ticker, curr_date, 30)
 
         return data_trans
 
@@ -357,7 +447,7 @@ class Toolkit:
             str: A formatted string containing the latest news from Google News based on the query and date range.
         """
 
-        google_news_results = interface.get_google_news(query, curr_date, 7)
+        google_news_results = vendors.fetch("news", query, curr_date, 7)
 
         return google_news_results
 
@@ -412,8 +502,6 @@ class Toolkit:
             str: A formatted string containing the latest fundamental information about the company on the given date.
         """
 
-        openai_fundamentals_results = interface.get_fundamentals_openai(
-            ticker, curr_date
-        )
+        openai_fundamentals_results = vendors.fetch("fundamentals", ticker, curr_date)
 
         return openai_fundamentals_results
@@ -1,6 +1,6 @@
 import chromadb
 from chromadb.config import Settings
-from openai import OpenAI
+from tradingagents.dataflows.openai_clients import get_openai_client
 import os
 
 
@@ -11,7 +11,7 @@ class FinancialSituationMemory:
         
         if config["backend_url"] == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
-            self.client = OpenAI(base_url=config["backend_url"])
+            self.client = get_openai_client(config["backend_url"])
             self.embedding_client = None
         elif config["backend_url"] == "https://maas-cn-southwest-2.modelarts-maas.com/v1/infers/8a062fd4-7367-4ab4-a936-5eeb8fb821c4/v1":
             # DeepSeek不支持embedding，使用简单的文本匹配作为备选
@@ -32,7 +32,7 @@ class FinancialSituationMemory:
                 raise ImportError("请安装langchain-google-genai包: pip install langchain-google-genai")
         else:
             self.embedding = "text-embedding-3-small"
-            self.client = OpenAI(base_url=config["backend_url"])
+            self.client = get_openai_client(config["backend_url"])
             self.embedding_client = None
         
         self.chroma_client = chromadb.Client(Settings(allow_reset=True))
@@ -71,8 +71,7 @@ class FinancialSituationMemory:
                 print("尝试使用OpenAI兼容的embedding作为备选方案...")
                 # 如果Google embedding失败，尝试使用OpenAI作为备选
                 try:
-                    from openai import OpenAI
-                    fallback_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                    fallback_client = get_openai_client(api_key=os.getenv("OPENAI_API_KEY"))
                     response = fallback_client.embeddings.create(
                         model="text-embedding-3-small", input=text
                     )
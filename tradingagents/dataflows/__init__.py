@@ -1,9 +1,32 @@
-from .finnhub_utils import get_data_in_range
-from .googlenews_utils import getNewsData
-from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .finnhub_utils import (
+    get_data_in_range,
+    FinnhubLoader,
+    get_finnhub_loader,
+    iter_unique_entries,
+    format_unique_entries,
+)
+from .googlenews_utils import NewsFetchError, getNewsData
+from .news_cache import NewsCache, get_news_cache
+from .response_cache import ResponseCache, get_response_cache
+from .openai_clients import get_openai_client, get_http_client
+from .yfin_utils import (
+    YFinanceUtils,
+    TickerCache,
+    get_ticker_cache,
+    warm_ticker_cache,
+)
+from .reddit_utils import (
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+    fetch_company_posts_range,
+)
+from .company_matcher import CompanyMatcher, build_company_aliases
 from .stockstats_utils import StockstatsUtils
+from .price_store import PriceStore, get_price_store
+from .price_cache import OnlinePriceCache, get_online_price_cache, download_watchlist
+from .simfin_utils import SimFinStatements, get_simfin_statements, get_simfin_asof_index
 from .yfin_utils import YFinanceUtils
+from .china_hk_provider import ChinaHKProvider, get_china_hk_provider
 from .china_hk_utils import (
     get_china_hk_stock_data,
     get_china_hk_company_info,
@@ -25,13 +48,24 @@ from .interface import (
     get_simfin_balance_sheet,
     get_simfin_cashflow,
     get_simfin_income_statements,
+    get_simfin_fundamentals_asof,
     # Technical analysis functions
     get_stock_stats_indicators_window,
+    get_stock_stats_indicators_table,
     get_stockstats_indicator,
     # Market data functions
     get_YFin_data_window,
     get_YFin_data,
 )
+from .warmup import warm_up
+from .vendors import (
+    VendorRouter,
+    LocalFileVendor,
+    get_vendor_router,
+    register_vendor,
+    use_local_vendors,
+    vendor_stats,
+)
 
 __all__ = [
     # News and sentiment functions
@@ -45,8 +79,10 @@ __all__ = [
     "get_simfin_balance_sheet",
     "get_simfin_cashflow",
     "get_simfin_income_statements",
+    "get_simfin_fundamentals_asof",
     # Technical analysis functions
     "get_stock_stats_indicators_window",
+    "get_stock_stats_indicators_table",
     "get_stockstats_indicator",
     # Market data functions
     "get_YFin_data_window",
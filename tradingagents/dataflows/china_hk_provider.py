@@ -0,0 +1,441 @@
+"""
+Bulk A-share / Hong Kong daily prices from tushare and akshare.
+
+A whole market's daily bars are fetched in one call per trading day and
+cached on disk as ``{data_cache_dir}/china_hk/{market}/{yyyy-mm-dd}.csv``, so a
+universe of CN or HK symbols shares one request per day instead of one per
+symbol. Frames use the columns of the online US price tool (Date, Open, High,
+Low, Close, Volume) with yfinance-style symbols (600519.SS, 0700.HK).
+
+Sources, in order of preference:
+- tushare ``pro.daily`` / ``pro.hk_daily`` for any date (needs TUSHARE_TOKEN)
+- akshare spot tables for today's snapshot, cached once the session has closed
+- akshare per-symbol history when a range is too long to assemble from snapshots
+  or no tushare token is set. akshare has no whole-market history by date, so
+  these bars are cached per symbol in ``{market}/history/{symbol}.csv`` with a
+  ``.json`` sidecar recording the date range they cover, and later requests
+  only fetch the days outside that range.
+
+Snapshots hold unadjusted exchange prices. The per-symbol history also keeps
+an adjustment factor, the ratio of akshare's back-adjusted (hfq) close to the
+close, which does not change once printed and so stays valid in the cache.
+symbol_history(adjusted=True) scales the bars by it to forward-adjusted prices,
+as Yahoo Finance reports them; the CN/HK price tool and online indicators read
+those.
+"""
+
+import functools
+import json
+import os
+import threading
+from typing import Annotated, Dict, Optional
+
+import pandas as pd
+
+from .config import get_config
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+SNAPSHOT_COLUMNS = ["Symbol", "Date"] + PRICE_COLUMNS
+HISTORY_COLUMNS = PRICE_COLUMNS + ["Adj Factor"]
+
+# Most missing days fetched as market snapshots for one history request
+CHINA_HK_MAX_SNAPSHOT_FETCHES = 20
+
+# A-share volumes are quoted in lots of 100 shares
+_CN_LOT_SIZE = 100
+
+# Exchange time zone and local close of each market, spot tables fetched after
+# the close hold the day's final bars
+_MARKET_CLOSE = {
+    "cn": ("Asia/Shanghai", "15:05"),
+    "hk": ("Asia/Hong_Kong", "16:15"),
+}
+
+
+def china_hk_market(symbol: Annotated[str, "ticker symbol"]) -> Optional[str]:
+    """"cn" for .SS/.SZ symbols, "hk" for .HK symbols, None otherwise."""
+    symbol = symbol.upper()
+    if symbol.endswith((".SS", ".SZ")):
+        return "cn"
+    if symbol.endswith(".HK"):
+        return "hk"
+    return None
+
+
+def to_tushare_code(symbol):
+    code, suffix = symbol.upper().rsplit(".", 1)
+    if suffix == "SS":
+        return f"{code}.SH"
+    if suffix == "HK":
+        return f"{code.zfill(5)}.HK"
+    return f"{code}.{suffix}"
+
+
+def from_tushare_code(ts_code):
+    code, suffix = ts_code.rsplit(".", 1)
+    if suffix == "SH":
+        return f"{code}.SS"
+    if suffix == "HK":
+        return f"{code[1:] if len(code) == 5 and code[0] == '0' else code}.HK"
+    return f"{code}.{suffix}"
+
+
+def from_akshare_code(code, market):
+    if market == "hk":
+        return from_tushare_code(f"{code}.HK")
+    return f"{code}.SS" if code[0] in "69" else f"{code}.SZ"
+
+
+def _import_akshare():
+    try:
+        import akshare
+    except ImportError:
+        return None
+    return akshare
+
+
+def _import_tushare():
+    try:
+        import tushare
+    except ImportError:
+        return None
+    return tushare
+
+
+class ChinaHKProvider:
+    """Daily CN/HK market snapshots with an on-disk cache by date."""
+
+    def __init__(
+        self,
+        cache_dir: Annotated[str, "directory for the cached snapshots"],
+        tushare_token: Annotated[Optional[str], "tushare pro token"] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.tushare_token = tushare_token
+        self._pro = None
+        self._cn_trade_days = None
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def snapshot_path(self, market, trade_date):
+        return os.path.join(self.cache_dir, market, f"{trade_date}.csv")
+
+    def history_path(self, symbol):
+        return os.path.join(self.cache_dir, china_hk_market(symbol), "history", f"{symbol}.csv")
+
+    def history_meta_path(self, symbol):
+        return os.path.join(self.cache_dir, china_hk_market(symbol), "history", f"{symbol}.json")
+
+    def _tushare(self):
+        if self._pro is None and self.tushare_token:
+            tushare = _import_tushare()
+            if tushare is not None:
+                self._pro = tushare.pro_api(self.tushare_token)
+        return self._pro
+
+    def _date_lock(self, market, trade_date):
+        with self._lock:
+            return self._locks.setdefault((market, trade_date), threading.Lock())
+
+    @staticmethod
+    def _market_now(market):
+        return pd.Timestamp.now(tz=_MARKET_CLOSE[market][0])
+
+    def _session_closed(self, market, trade_date):
+        """Whether trade_date was a trading day whose session has closed."""
+        now = self._market_now(market)
+        today = now.strftime("%Y-%m-%d")
+        if trade_date > today or (
+            trade_date == today and now.strftime("%H:%M") < _MARKET_CLOSE[market][1]
+        ):
+            return False
+        if pd.Timestamp(trade_date).dayofweek >= 5:
+            return False
+        if market == "cn":
+            # spot tables repeat the last session on holidays
+            trade_days = self._cn_calendar()
+            return trade_days is not None and trade_date in trade_days
+        return True
+
+    def _cn_calendar(self):
+        if self._cn_trade_days is None:
+            akshare = _import_akshare()
+            if akshare is None:
+                return None
+            try:
+                calendar = akshare.tool_trade_date_hist_sina()
+            except Exception:
+                return None
+            self._cn_trade_days = set(pd.to_datetime(calendar["trade_date"]).dt.strftime("%Y-%m-%d"))
+        return self._cn_trade_days
+
+    @staticmethod
+    def _write_csv(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        data.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def cached_snapshot(self, market, trade_date) -> Optional[pd.DataFrame]:
+        try:
+            data = pd.read_csv(self.snapshot_path(market, trade_date), dtype={"Symbol": str})
+        except FileNotFoundError:
+            return None
+        data["Date"] = pd.to_datetime(data["Date"])
+        return data
+
+    def snapshot(
+        self,
+        market: Annotated[str, "cn or hk"],
+        trade_date: Annotated[str, "yyyy-mm-dd"],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Daily bars of every symbol of the market on trade_date, empty on
+        non-trading days, None when no source can provide that date.
+        """
+        with self._date_lock(market, trade_date):
+            data = self.cached_snapshot(market, trade_date)
+            if data is not None:
+                return data
+
+            if self._tushare() is not None:
+                data = self._tushare_snapshot(market, trade_date)
+            elif trade_date == self._market_now(market).strftime("%Y-%m-%d"):
+                data = self._akshare_spot(market, trade_date)
+                # provisional until the close, only then written to disk
+                if data is None or not self._session_closed(market, trade_date):
+                    return data
+            else:
+                return None
+
+            self._write_csv(self.snapshot_path(market, trade_date), data)
+            return data
+
+    def history(
+        self,
+        symbol: Annotated[str, "yfinance-style symbol, e.g. 600519.SS or 0700.HK"],
+        start_date: Annotated[str, "yyyy-mm-dd"],
+        end_date: Annotated[str, "exclusive end, yyyy-mm-dd"],
+    ) -> pd.DataFrame:
+        """Daily bars of symbol in [start_date, end_date), indexed by Date."""
+        symbol = symbol.upper()
+        market = china_hk_market(symbol)
+        days = [
+            day.strftime("%Y-%m-%d")
+            for day in pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1))
+        ]
+
+        snapshots = {day: self.cached_snapshot(market, day) for day in days}
+        missing = [day for day, data in snapshots.items() if data is None]
+        if missing and (
+            self._tushare() is None or len(missing) > CHINA_HK_MAX_SNAPSHOT_FETCHES
+        ):
+            return self.symbol_history(symbol, start_date, end_date)
+
+        for day in missing:
+            snapshots[day] = self.snapshot(market, day)
+
+        frames = [
+            data[data["Symbol"] == symbol]
+            for data in snapshots.values()
+            if data is not None and not data.empty
+        ]
+        if not frames:
+            return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+        data = pd.concat(frames).sort_values("Date")
+        return data.set_index("Date")[PRICE_COLUMNS]
+
+    def symbol_history(
+        self,
+        symbol: Annotated[str, "yfinance-style symbol, e.g. 600519.SS or 0700.HK"],
+        start_date: Annotated[str, "yyyy-mm-dd"],
+        end_date: Annotated[str, "exclusive end, yyyy-mm-dd"],
+        adjusted: Annotated[bool, "forward-adjust the bars to the last one returned"] = False,
+    ) -> pd.DataFrame:
+        """
+        Daily bars of symbol in [start_date, end_date) from the per-symbol
+        akshare history cache, fetching only the days it does not cover yet.
+        """
+        symbol = symbol.upper()
+        market = china_hk_market(symbol)
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+
+        with self._date_lock(market, symbol):
+            data, meta = self._read_history(symbol)
+            if meta is None:
+                gaps = [(start, end)]
+            else:
+                covered_start = pd.Timestamp(meta["start"])
+                covered_end = pd.Timestamp(meta["end"])
+                # gaps are fetched up to the covered range, so it stays contiguous
+                gaps = []
+                if start < covered_start:
+                    gaps.append((start, covered_start))
+                if end > covered_end:
+                    gaps.append((covered_end, end))
+
+            fetched, complete = [], True
+            for gap_start, gap_end in gaps:
+                bars = self._akshare_history(
+                    symbol, market, gap_start.strftime("%Y-%m-%d"), gap_end.strftime("%Y-%m-%d")
+                )
+                if bars is None:
+                    complete = False
+                    break
+                # no bars on holidays, suspensions or before the listing
+                if not bars.empty:
+                    fetched.append(bars.reset_index())
+
+            if data is None:
+                data = pd.DataFrame(columns=["Date"] + HISTORY_COLUMNS)
+                data["Date"] = pd.to_datetime(data["Date"])
+            if fetched:
+                data = pd.concat(([data] if not data.empty else []) + fetched, ignore_index=True)
+                data = data.drop_duplicates(subset="Date", keep="last").sort_values("Date")
+                data = data.reset_index(drop=True)
+            if gaps and complete:
+                # today's bar is provisional until the close and fetched again later
+                today = self._market_now(market).tz_localize(None).normalize()
+                settled_end = today
+                if self._session_closed(market, today.strftime("%Y-%m-%d")):
+                    settled_end += pd.Timedelta(days=1)
+                settled = data[data["Date"] < settled_end]
+                settled_end = min(end, settled_end)
+                if meta is None:
+                    covered = (start, max(settled_end, start))
+                else:
+                    covered = (min(start, covered_start), max(settled_end, covered_end))
+                self._write_history(symbol, settled, *covered)
+
+        data = data[(data["Date"] >= start) & (data["Date"] < end)].set_index("Date")
+        if adjusted and not data.empty:
+            # forward-adjusted like Yahoo Finance, without looking past the last bar
+            factor = data["Adj Factor"].astype(float).ffill().bfill()
+            scale = factor / factor.iloc[-1]
+            data = data.copy()
+            for column in ["Open", "High", "Low", "Close"]:
+                data[column] = data[column].astype(float) * scale
+        return data[PRICE_COLUMNS]
+
+    def history_range(self, symbol: Annotated[str, "yfinance-style symbol"]):
+        """(start, exclusive end) covered by the symbol's cached history, or None."""
+        try:
+            with open(self.history_meta_path(symbol.upper()), "r") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+
+    def _read_history(self, symbol):
+        try:
+            with open(self.history_meta_path(symbol), "r") as f:
+                meta = json.load(f)
+            data = pd.read_csv(self.history_path(symbol))
+        except (FileNotFoundError, ValueError):
+            return None, None
+        if "Adj Factor" not in data.columns:
+            # written before the adjustment factor was kept, fetched again
+            return None, None
+        data["Date"] = pd.to_datetime(data["Date"])
+        return data, meta
+
+    def _write_history(self, symbol, data, start, end):
+        self._write_csv(self.history_path(symbol), data[["Date"] + HISTORY_COLUMNS])
+        meta = {
+            "symbol": symbol,
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "updated": pd.Timestamp.now().isoformat(timespec="seconds"),
+        }
+        meta_path = self.history_meta_path(symbol)
+        with open(f"{meta_path}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _tushare_snapshot(self, market, trade_date):
+        fetch = self._pro.daily if market == "cn" else self._pro.hk_daily
+        raw = fetch(trade_date=trade_date.replace("-", ""))
+        if raw is None or raw.empty:
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+        data = pd.DataFrame(
+            {
+                "Symbol": raw["ts_code"].map(from_tushare_code),
+                "Date": pd.to_datetime(raw["trade_date"]),
+                "Open": raw["open"],
+                "High": raw["high"],
+                "Low": raw["low"],
+                "Close": raw["close"],
+                "Volume": raw["vol"] * (_CN_LOT_SIZE if market == "cn" else 1),
+            }
+        )
+        return data.sort_values("Symbol").reset_index(drop=True)
+
+    @staticmethod
+    def _akshare_spot(market, trade_date):
+        akshare = _import_akshare()
+        if akshare is None:
+            return None
+        raw = akshare.stock_zh_a_spot_em() if market == "cn" else akshare.stock_hk_spot_em()
+        data = pd.DataFrame(
+            {
+                "Symbol": raw["代码"].map(lambda code: from_akshare_code(code, market)),
+                "Date": pd.Timestamp(trade_date),
+                "Open": raw["今开"],
+                "High": raw["最高"],
+                "Low": raw["最低"],
+                "Close": raw["最新价"],
+                "Volume": raw["成交量"] * (_CN_LOT_SIZE if market == "cn" else 1),
+            }
+        )
+        # suspended symbols have no quote
+        return data.dropna(subset=["Close"]).reset_index(drop=True)
+
+    @staticmethod
+    def _akshare_history(symbol, market, start_date, end_date):
+        akshare = _import_akshare()
+        if akshare is None:
+            return None
+        code = symbol.rsplit(".", 1)[0]
+        if market == "cn":
+            fetch = functools.partial(akshare.stock_zh_a_hist, symbol=code)
+        else:
+            fetch = functools.partial(akshare.stock_hk_hist, symbol=code.zfill(5))
+        dates = dict(
+            start_date=start_date.replace("-", ""),
+            end_date=(pd.Timestamp(end_date) - pd.Timedelta(days=1)).strftime("%Y%m%d"),
+        )
+        raw = fetch(**dates)
+        if raw is None or raw.empty:
+            return pd.DataFrame(columns=HISTORY_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+        back_adjusted = fetch(**dates, adjust="hfq")
+        index = pd.DatetimeIndex(pd.to_datetime(raw["日期"]), name="Date")
+        back_close = pd.Series(
+            back_adjusted["收盘"].values, index=pd.to_datetime(back_adjusted["日期"])
+        ).reindex(index)
+        return pd.DataFrame(
+            {
+                "Open": raw["开盘"].values,
+                "High": raw["最高"].values,
+                "Low": raw["最低"].values,
+                "Close": raw["收盘"].values,
+                "Volume": raw["成交量"].values * (_CN_LOT_SIZE if market == "cn" else 1),
+                "Adj Factor": back_close.values / raw["收盘"].values,
+            },
+            index=index,
+        )
+
+
+_providers: Dict[str, ChinaHKProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_china_hk_provider() -> ChinaHKProvider:
+    """Process-wide ChinaHKProvider caching under data_cache_dir."""
+    cache_dir = os.path.abspath(os.path.join(get_config()["data_cache_dir"], "china_hk"))
+    with _providers_lock:
+        provider = _providers.get(cache_dir)
+        if provider is None:
+            provider = ChinaHKProvider(cache_dir, os.getenv("TUSHARE_TOKEN"))
+            _providers[cache_dir] = provider
+        return provider
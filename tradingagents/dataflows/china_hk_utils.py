@@ -8,6 +8,9 @@ import pandas as pd
 from typing import Annotated, Optional, Dict, List
 from datetime import datetime, timedelta
 
+from .yfin_utils import get_ticker_cache
+from .china_hk_provider import get_china_hk_provider
+
 # 中国和香港股票代码映射
 CHINA_HK_TICKERS = {
     # 香港股票
@@ -47,6 +50,7 @@ def get_china_hk_stock_data(
     symbol: Annotated[str, "股票代码，支持A股和港股格式"],
     start_date: Annotated[str, "开始日期 YYYY-MM-DD"],
     end_date: Annotated[str, "结束日期 YYYY-MM-DD"],
+    adjusted: Annotated[bool, "是否返回前复权价格"] = False,
 ) -> pd.DataFrame:
     """
     获取中国和香港股票的历史数据
@@ -55,6 +59,7 @@ def get_china_hk_stock_data(
         symbol: 股票代码 (如: 0700.HK, 600000.SS, 000001.SZ)
         start_date: 开始日期
         end_date: 结束日期
+        adjusted: 为True时返回按个股历史缓存计算的前复权价格，与yfinance的复权价一致
     
     Returns:
         股票历史数据的DataFrame
@@ -63,9 +68,21 @@ def get_china_hk_stock_data(
         # 标准化股票代码
         symbol = symbol.upper()
         
-        # 使用yfinance获取数据
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(start=start_date, end=end_date)
+        # 优先使用按日期缓存的全市场日线 (tushare/akshare)
+        try:
+            provider = get_china_hk_provider()
+            if adjusted:
+                data = provider.symbol_history(symbol, start_date, end_date, adjusted=True)
+            else:
+                data = provider.history(symbol, start_date, end_date)
+        except Exception as e:
+            print(f"批量行情源获取 {symbol} 数据失败, 改用yfinance: {e}")
+            data = pd.DataFrame()
+
+        if data.empty:
+            # 使用yfinance获取数据
+            ticker = get_ticker_cache().ticker(symbol)
+            data = ticker.history(start=start_date, end=end_date)
         
         if data.empty:
             return pd.DataFrame()
@@ -89,8 +106,7 @@ def get_china_hk_company_info(
     """
     try:
         symbol = symbol.upper()
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = get_ticker_cache().get(symbol, "info")
         
         # 添加中文名称
         company_name = CHINA_HK_TICKERS.get(symbol, info.get("shortName", "N/A"))
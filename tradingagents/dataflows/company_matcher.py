@@ -0,0 +1,74 @@
+"""
+Precompiled matching of company mentions in free text.
+
+Every ticker's aliases are compiled once into a single case-insensitive
+alternation. A CompanyMatcher also keeps one alternation over the aliases of
+all its tickers, so a text that mentions none of them is rejected with a single
+regex scan and a whole watchlist can be tagged in one pass over a corpus.
+"""
+
+import re
+from typing import Annotated, Dict, Iterable, List
+
+
+def build_company_aliases(*tables: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Merge ticker -> company name tables into ticker -> aliases. Names may hold
+    several aliases separated by " OR "; the ticker itself is always an alias.
+    """
+    aliases: Dict[str, List[str]] = {}
+    for table in tables:
+        for ticker, names in table.items():
+            ticker_aliases = aliases.setdefault(ticker, [])
+            for name in names.split(" OR "):
+                if name and name not in ticker_aliases:
+                    ticker_aliases.append(name)
+    for ticker, ticker_aliases in aliases.items():
+        if ticker not in ticker_aliases:
+            ticker_aliases.append(ticker)
+    return aliases
+
+
+def _alternation(terms: Iterable[str]):
+    # aliases are regular expressions, as they were when searched one by one
+    return re.compile("|".join(f"(?:{term})" for term in terms), re.IGNORECASE)
+
+
+class CompanyMatcher:
+    """Tags texts with the tickers whose aliases they mention."""
+
+    def __init__(
+        self,
+        aliases: Annotated[Dict[str, List[str]], "ticker -> aliases"],
+        tickers: Annotated[Iterable[str], "tickers to match, defaults to all"] = None,
+    ):
+        if tickers is None:
+            tickers = list(aliases)
+        self.tickers = list(dict.fromkeys(tickers))
+        # unknown tickers are only matched by their symbol
+        self.aliases = {ticker: aliases.get(ticker, [ticker]) for ticker in self.tickers}
+        self.patterns = {
+            ticker: _alternation(ticker_aliases)
+            for ticker, ticker_aliases in self.aliases.items()
+        }
+        all_aliases = dict.fromkeys(
+            alias for ticker_aliases in self.aliases.values() for alias in ticker_aliases
+        )
+        self.any_pattern = _alternation(all_aliases)
+
+    def matches(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        *texts: Annotated[str, "texts to search"],
+    ) -> bool:
+        """Whether any of texts mentions the ticker."""
+        pattern = self.patterns[ticker]
+        return any(pattern.search(text) for text in texts)
+
+    def tag(self, *texts: Annotated[str, "texts to search"]) -> List[str]:
+        """Tickers mentioned in any of texts, in the matcher's ticker order."""
+        if not any(self.any_pattern.search(text) for text in texts):
+            return []
+        if len(self.tickers) == 1:
+            return list(self.tickers)
+        return [ticker for ticker in self.tickers if self.matches(ticker, *texts)]
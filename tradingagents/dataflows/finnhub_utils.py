@@ -1,5 +1,212 @@
 import json
 import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from .config import get_config
+
+# Upper bound on the decoded Finnhub files kept in memory, measured by file size
+FINNHUB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def get_data_path(ticker, data_type, data_dir, period=None):
+    """Path of the formatted finnhub json file for a ticker and data type."""
+    if period:
+        return os.path.join(
+            data_dir,
+            "finnhub_data",
+            data_type,
+            f"{ticker}_{period}_data_formatted.json",
+        )
+    return os.path.join(
+        data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
+    )
+
+
+class FinnhubFile:
+    """A decoded finnhub file with its date keys in sorted order."""
+
+    def __init__(self, data, nbytes, mtime):
+        self.keys = sorted(data)
+        self.values = [data[key] for key in self.keys]
+        self.nbytes = nbytes
+        self.mtime = mtime
+
+    def get_range(self, start_date, end_date):
+        lo = bisect_left(self.keys, start_date)
+        hi = bisect_right(self.keys, end_date)
+        return {
+            self.keys[i]: self.values[i]
+            for i in range(lo, hi)
+            if len(self.values[i]) > 0
+        }
+
+
+class FinnhubLoader:
+    """
+    Parses each finnhub file once and answers date range queries with bisect.
+    Decoded files are kept in an LRU bounded by their size on disk. A file can
+    also be converted to SQLite with convert(), after which range queries are
+    served from the database without decoding the whole file.
+    """
+
+    def __init__(self, max_bytes=FINNHUB_CACHE_MAX_BYTES, sqlite_dir=None):
+        self.max_bytes = max_bytes
+        self.sqlite_dir = sqlite_dir
+        self._files = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get_range(self, data_path, start_date, end_date):
+        """Entries of data_path whose date key is in [start_date, end_date] and non-empty."""
+        mtime = os.path.getmtime(data_path)
+
+        sqlite_path = self.sqlite_path(data_path)
+        if sqlite_path and os.path.exists(sqlite_path):
+            if os.path.getmtime(sqlite_path) >= mtime:
+                return self._get_range_sqlite(sqlite_path, start_date, end_date)
+
+        return self.load(data_path, mtime).get_range(start_date, end_date)
+
+    def load(self, data_path, mtime=None):
+        """Return the decoded file, reading it only if it is not cached or has changed."""
+        if mtime is None:
+            mtime = os.path.getmtime(data_path)
+
+        with self._lock:
+            cached = self._files.get(data_path)
+            if cached is not None and cached.mtime == mtime:
+                self._files.move_to_end(data_path)
+                return cached
+
+        with open(data_path, "r") as f:
+            data = json.load(f)
+        loaded = FinnhubFile(data, os.path.getsize(data_path), mtime)
+
+        with self._lock:
+            previous = self._files.pop(data_path, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            if loaded.nbytes <= self.max_bytes:
+                self._files[data_path] = loaded
+                self._nbytes += loaded.nbytes
+                while self._nbytes > self.max_bytes:
+                    _, evicted = self._files.popitem(last=False)
+                    self._nbytes -= evicted.nbytes
+        return loaded
+
+    def sqlite_path(self, data_path):
+        if not self.sqlite_dir:
+            return None
+        # keep the data type in the name, the same ticker exists for every type
+        data_type = os.path.basename(os.path.dirname(data_path))
+        stem = os.path.splitext(os.path.basename(data_path))[0]
+        return os.path.join(self.sqlite_dir, f"{data_type}-{stem}.sqlite")
+
+    def convert(self, data_path):
+        """Convert a finnhub json file to an indexed SQLite database."""
+        sqlite_path = self.sqlite_path(data_path)
+        if sqlite_path is None:
+            raise ValueError("FinnhubLoader: no sqlite_dir configured for conversion")
+        os.makedirs(self.sqlite_dir, exist_ok=True)
+
+        loaded = self.load(data_path)
+        tmp_path = sqlite_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with sqlite3.connect(tmp_path) as conn:
+            conn.execute("CREATE TABLE data (date TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany(
+                "INSERT INTO data VALUES (?, ?)",
+                (
+                    (key, json.dumps(value))
+                    for key, value in zip(loaded.keys, loaded.values)
+                ),
+            )
+        os.replace(tmp_path, sqlite_path)
+        return sqlite_path
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._nbytes = 0
+
+    @staticmethod
+    def _get_range_sqlite(sqlite_path, start_date, end_date):
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            rows = conn.execute(
+                "SELECT date, value FROM data WHERE date >= ? AND date <= ? ORDER BY date",
+                (start_date, end_date),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        filtered_data = {}
+        for key, value in rows:
+            value = json.loads(value)
+            if len(value) > 0:
+                filtered_data[key] = value
+        return filtered_data
+
+
+def entry_key(entry, key_fields=None):
+    """
+    Canonical hashable key of a finnhub entry. With key_fields, only those fields
+    are used (e.g. a filing id); otherwise the key covers every field, so two
+    entries share a key exactly when they are equal dicts.
+    """
+    if key_fields:
+        return tuple(_freeze(entry.get(field)) for field in key_fields)
+    return _freeze(entry)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def iter_unique_entries(data, key_fields=None):
+    """
+    Yield (date, entry) for every entry of a get_data_in_range result, skipping
+    entries already seen on an earlier date. Dedup uses a set of entry_key()s.
+    """
+    seen = set()
+    for date, entries in data.items():
+        for entry in entries:
+            key = entry_key(entry, key_fields)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield date, entry
+
+
+def format_unique_entries(data, formatter, key_fields=None):
+    """Format each unique entry with formatter(date, entry) and join the results."""
+    return "".join(
+        formatter(date, entry)
+        for date, entry in iter_unique_entries(data, key_fields)
+    )
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_finnhub_loader():
+    """Process-wide FinnhubLoader, converted files live under data_cache_dir."""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = FinnhubLoader(
+                sqlite_dir=os.path.join(get_config()["data_cache_dir"], "finnhub")
+            )
+        return _loader
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -11,26 +218,10 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         data_type (str): Type of data from finnhub to fetch. Can be insider_trans, SEC_filings, news_data, insider_senti, or fin_as_reported.
         data_dir (str): Directory where the data is saved.
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
+    Returns:
+        dict: entries keyed by date (YYYY-MM-DD) in ascending order. The lists are
+        shared with the in-process cache and must not be modified.
     """
 
-    if period:
-        data_path = os.path.join(
-            data_dir,
-            "finnhub_data",
-            data_type,
-            f"{ticker}_{period}_data_formatted.json",
-        )
-    else:
-        data_path = os.path.join(
-            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
-        )
-
-    data = open(data_path, "r")
-    data = json.load(data)
-
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    data_path = get_data_path(ticker, data_type, data_dir, period)
+    return get_finnhub_loader().get_range(data_path, start_date, end_date)
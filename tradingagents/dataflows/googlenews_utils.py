@@ -1,6 +1,10 @@
 import json
+import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import random
@@ -12,6 +16,76 @@ from tenacity import (
     retry_if_result,
 )
 
+# Global budget for requests to Google shared by every caller in the process
+GOOGLE_NEWS_REQUESTS_PER_SECOND = 0.5
+GOOGLE_NEWS_BURST = 2
+GOOGLE_NEWS_MAX_WORKERS = 4
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+
+class NewsFetchError(Exception):
+    """A result page could not be fetched, so the results are incomplete."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate across threads.
+    Rate limiting responses halve the rate and pause the bucket; the rate then
+    recovers gradually with every successful request.
+    """
+
+    def __init__(self, rate, capacity, min_rate=0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            # jitter keeps concurrent callers from waking up in lockstep
+            time.sleep(wait + random.uniform(0, 0.1))
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+    def on_rate_limited(self, pause):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+
+rate_limiter = TokenBucket(GOOGLE_NEWS_REQUESTS_PER_SECOND, GOOGLE_NEWS_BURST)
+
+session = requests.Session()
+session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=GOOGLE_NEWS_MAX_WORKERS),
+)
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -25,18 +99,90 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    rate_limiter.acquire()
+    response = session.get(url, headers=headers)
+    if is_rate_limited(response):
+        retry_after = response.headers.get("Retry-After", "")
+        rate_limiter.on_rate_limited(float(retry_after) if retry_after.isdigit() else 4)
+    else:
+        rate_limiter.on_success()
     return response
 
 
-def getNewsData(query, start_date, end_date):
+def build_url(query, start_date, end_date, offset):
+    return (
+        f"https://www.google.com/search?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={offset}"
+    )
+
+
+def parse_results(soup):
+    """Extract the news results of one search result page."""
+    news_results = []
+    for el in soup.select("div.SoaBEf"):
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    return news_results
+
+
+def parse_page_offsets(soup):
+    """Result offsets of the pages linked from the pagination bar."""
+    offsets = set()
+    for link in soup.select("a[href*='start=']"):
+        match = re.search(r"[?&]start=(\d+)", link["href"])
+        if match:
+            offsets.add(int(match.group(1)))
+    return offsets
+
+
+def fetch_page(query, start_date, end_date, offset):
+    """Fetch and parse one result page, None if it could not be fetched."""
+    try:
+        response = make_request(build_url(query, start_date, end_date, offset), HEADERS)
+    except Exception as e:
+        print(f"Failed after multiple retries: {e}")
+        return None
+    if response.status_code != 200:
+        # an error page has no results, which must not pass for an empty day
+        print(f"Google News returned HTTP {response.status_code}")
+        return None
+    soup = BeautifulSoup(response.content, "html.parser")
+    return {
+        "results": parse_results(soup),
+        "offsets": parse_page_offsets(soup),
+        "has_next": soup.find("a", id="pnnext") is not None,
+    }
+
+
+def getNewsData(query, start_date, end_date, max_workers=GOOGLE_NEWS_MAX_WORKERS):
     """
     Scrape Google News search results for a given query and date range.
+    The first page tells how many result pages the pagination bar links to;
+    those pages are then fetched concurrently under the shared rate limiter,
+    continuing with the next pages for as long as the last one has a "Next" link.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    Raises NewsFetchError when a page could not be fetched, so that an
+    incomplete result is never mistaken for a complete one.
     """
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
@@ -45,64 +191,45 @@ def getNewsData(query, start_date, end_date):
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
         end_date = end_date.strftime("%m/%d/%Y")
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
-
-    news_results = []
-    page = 0
-    while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
+    pages = {}
+    first_page = fetch_page(query, start_date, end_date, 0)
+    if first_page is None:
+        raise NewsFetchError(f"Could not fetch Google News for {query}")
+    pages[0] = first_page
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pages:
+            last_offset = max(pages)
+            last_page = pages[last_offset]
+            if not last_page["results"] or not last_page["has_next"]:
                 break
 
-            page += 1
-
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
+            # pages linked from the pagination bar that were not fetched yet,
+            # at least the one behind the "Next" link
+            offsets = {
+                offset
+                for page in pages.values()
+                for offset in page["offsets"]
+                if offset > last_offset
+            }
+            offsets.add(last_offset + 10)
+            offsets = sorted(offsets - set(pages))
+
+            fetched = list(
+                executor.map(
+                    lambda offset: fetch_page(query, start_date, end_date, offset),
+                    offsets,
+                )
+            )
+            if any(page is None for page in fetched):
+                raise NewsFetchError(f"Could not fetch all Google News pages for {query}")
+            pages.update(zip(offsets, fetched))
+
+    # keep the results in page order, up to the first page without results
+    news_results = []
+    for offset in sorted(pages):
+        if not pages[offset]["results"]:
             break
+        news_results.extend(pages[offset]["results"])
 
     return news_results
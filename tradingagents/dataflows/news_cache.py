@@ -0,0 +1,194 @@
+"""
+Persistent per-day cache of Google News search results.
+
+Results are stored in SQLite keyed by (query, day). A request for a window is
+split into cached and missing days, only the missing days are scraped, and the
+window is then reassembled in date order. Reruns of the same ticker on
+consecutive trade dates therefore scrape a single new day instead of the whole
+look-back window.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Annotated, Callable, Dict, List, Optional
+
+from .config import get_config
+
+# How long a cached day stays valid, by how settled its news is
+NEWS_CACHE_TTL_PAST = 30 * 24 * 3600  # days older than NEWS_CACHE_RECENT_DAYS
+NEWS_CACHE_TTL_RECENT = 3600  # today and the days just before, still filling up
+NEWS_CACHE_TTL_EMPTY = 6 * 3600  # no results, possibly a blocked request
+NEWS_CACHE_RECENT_DAYS = 2
+# Upper bound on the stored results, least recently used days go first
+NEWS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Missing days fetched in parallel, the fetcher's own rate limit still applies
+NEWS_CACHE_MAX_WORKERS = 4
+
+
+class NewsCache:
+    """SQLite-backed (query, day) -> results cache with TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        db_path: Annotated[str, "path of the SQLite database"],
+        max_bytes: Annotated[int, "bound on the stored results"] = NEWS_CACHE_MAX_BYTES,
+    ):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS news ("
+                "query TEXT, day TEXT, results TEXT, nbytes INTEGER, "
+                "expires REAL, accessed REAL, PRIMARY KEY (query, day))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS news_accessed ON news (accessed)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get_days(
+        self,
+        query: Annotated[str, "search query"],
+        days: Annotated[List[str], "days in yyyy-mm-dd format"],
+    ) -> Dict[str, list]:
+        """Unexpired cached results of the given days; missing days are absent."""
+        if not days:
+            return {}
+        now = time.time()
+        placeholders = ",".join("?" * len(days))
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT day, results FROM news WHERE query = ? "
+                f"AND day IN ({placeholders}) AND expires > ?",
+                (query, *days, now),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE news SET accessed = ? WHERE query = ? AND day = ?",
+                [(now, query, day) for day, _ in rows],
+            )
+        return {day: json.loads(results) for day, results in rows}
+
+    def put_day(
+        self,
+        query: Annotated[str, "search query"],
+        day: Annotated[str, "day in yyyy-mm-dd format"],
+        results: Annotated[list, "results scraped for that day"],
+    ):
+        now = time.time()
+        payload = json.dumps(results)
+        expires = now + self.ttl(day, results)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO news VALUES (?, ?, ?, ?, ?, ?)",
+                (query, day, payload, len(payload), expires, now),
+            )
+            self._evict(conn, now)
+
+    @staticmethod
+    def ttl(day, results):
+        if not results:
+            return NEWS_CACHE_TTL_EMPTY
+        age = (date.today() - datetime.strptime(day, "%Y-%m-%d").date()).days
+        if age <= NEWS_CACHE_RECENT_DAYS:
+            return NEWS_CACHE_TTL_RECENT
+        return NEWS_CACHE_TTL_PAST
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM news WHERE expires <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM news").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for query, day, nbytes in conn.execute(
+            "SELECT query, day, nbytes FROM news ORDER BY accessed"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((query, day))
+            total -= nbytes
+        conn.executemany("DELETE FROM news WHERE query = ? AND day = ?", evicted)
+
+    def clear(self, query: Annotated[Optional[str], "only drop this query"] = None):
+        with self._lock, self._connect() as conn:
+            if query is None:
+                conn.execute("DELETE FROM news")
+            else:
+                conn.execute("DELETE FROM news WHERE query = ?", (query,))
+
+    def get_range(
+        self,
+        query: Annotated[str, "search query"],
+        start_date: Annotated[str, "first day, yyyy-mm-dd"],
+        end_date: Annotated[str, "last day (inclusive), yyyy-mm-dd"],
+        fetch_day: Annotated[Callable[[str, str], list], "fetch_day(query, day), raises on failure"],
+        max_workers: Annotated[int, "missing days fetched in parallel"] = NEWS_CACHE_MAX_WORKERS,
+    ) -> List[dict]:
+        """
+        Results of every day in [start_date, end_date], oldest day first,
+        scraping only the days that are not cached. A story listed on several
+        days is kept on the first one. Only days whose fetch completed are
+        cached; failed days are left out of the results, and the last error is
+        raised when no day could be had at all.
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        days = [
+            (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range((end - start).days + 1)
+        ]
+
+        cached = self.get_days(query, days)
+        missing = [day for day in days if day not in cached]
+
+        def fetch(day):
+            try:
+                return fetch_day(query, day), None
+            except Exception as e:
+                return None, e
+
+        last_error = None
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                for day, (results, error) in zip(missing, executor.map(fetch, missing)):
+                    if error is not None:
+                        print(f"News for {query} on {day} not fetched: {error}")
+                        last_error = error
+                        continue
+                    cached[day] = results
+                    self.put_day(query, day, results)
+        if not cached and last_error is not None:
+            raise last_error
+
+        news_results = []
+        seen = set()
+        for day in days:
+            for news in cached.get(day, []):
+                if news["link"] in seen:
+                    continue
+                seen.add(news["link"])
+                news_results.append(news)
+        return news_results
+
+
+_caches: Dict[str, NewsCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_news_cache() -> NewsCache:
+    """Process-wide NewsCache in the configured data_cache_dir."""
+    db_path = os.path.abspath(
+        os.path.join(get_config()["data_cache_dir"], "google_news.sqlite")
+    )
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = NewsCache(db_path)
+            _caches[db_path] = cache
+        return cache
@@ -0,0 +1,85 @@
+"""
+Process-wide registry of OpenAI-compatible clients.
+
+Clients are keyed by base_url and API key and kept for the life of the
+process, so every tool call, embedding and chat model talking to the same
+backend reuses one keep-alive connection pool instead of opening a new TLS
+connection per request.
+"""
+
+import os
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+
+# Connection pool limits of every shared HTTP client
+OPENAI_MAX_CONNECTIONS = 32
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 16
+OPENAI_KEEPALIVE_EXPIRY = 120.0
+
+_clients: Dict[Tuple[str, Optional[str], Optional[str]], object] = {}
+# reentrant, the OpenAI factories fetch their pooled HTTP client under the lock
+_clients_lock = threading.RLock()
+
+
+def _key(kind, base_url, api_key):
+    # resolve the default key now so that rotating OPENAI_API_KEY gets a new client
+    return kind, base_url, api_key or os.getenv("OPENAI_API_KEY")
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _get_or_create(key, factory):
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+
+def get_http_client(
+    base_url: Annotated[Optional[str], "API base url, None for the default"] = None,
+    api_key: Annotated[Optional[str], "API key, defaults to OPENAI_API_KEY"] = None,
+) -> httpx.Client:
+    """Shared keep-alive httpx client, e.g. for ChatOpenAI(http_client=...)."""
+    return _get_or_create(
+        _key("http", base_url, api_key),
+        lambda: httpx.Client(limits=_limits(), timeout=httpx.Timeout(600.0, connect=10.0)),
+    )
+
+
+def get_openai_client(
+    base_url: Annotated[Optional[str], "API base url, None for the default"] = None,
+    api_key: Annotated[Optional[str], "API key, defaults to OPENAI_API_KEY"] = None,
+) -> OpenAI:
+    """Shared OpenAI client for base_url and api_key."""
+    key = _key("openai", base_url, api_key)
+    return _get_or_create(
+        key,
+        lambda: OpenAI(
+            base_url=base_url,
+            api_key=key[2],
+            http_client=get_http_client(base_url, api_key),
+        ),
+    )
+
+
+def close_clients():
+    """Close the pooled synchronous connections and forget every client."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        if isinstance(client, (httpx.Client, OpenAI)):
+            client.close()
@@ -0,0 +1,364 @@
+"""
+Incremental on-disk cache for the online Yahoo Finance price history.
+
+Each symbol has a single ``{symbol}-YFin-data.csv`` file in ``data_cache_dir``
+and a ``{symbol}-YFin-data.json`` sidecar recording the date range it covers.
+When a newer range is requested only the missing tail bars are downloaded and
+merged in, instead of re-downloading the whole history every day.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+# Bars re-fetched before the cached end so dividend/split re-adjustments show up
+_OVERLAP_DAYS = 7
+
+_SNAPSHOT_RE = re.compile(
+    r"^(?P<symbol>.+)-YFin-data-\d{4}-\d{2}-\d{2}-\d{4}-\d{2}-\d{2}\.csv$"
+)
+
+
+class OnlinePriceCache:
+    """
+    Per-symbol price history kept up to date with tail-only downloads.
+
+    The cached range is ``[start, end)`` with ``end`` exclusive, matching the
+    ``start``/``end`` arguments of ``yf.download``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Annotated[str, "directory for the cached price files"],
+        history_years: Annotated[int, "years of history to keep per symbol"] = 15,
+    ):
+        self.cache_dir = cache_dir
+        self.history_years = history_years
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def data_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.csv")
+
+    def meta_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.json")
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        end_date: Annotated[
+            Optional[str], "exclusive end of the history, defaults to today"
+        ] = None,
+    ) -> pd.DataFrame:
+        """
+        Return the price history of symbol for the last ``history_years`` years
+        before end_date, downloading only the bars missing from the cache.
+        """
+        end = pd.Timestamp(end_date or pd.Timestamp.today()).normalize()
+        start = end - pd.DateOffset(years=self.history_years)
+
+        with self._lock(symbol):
+            data, meta = self._read(symbol)
+
+            if data is None:
+                data = self._download(symbol, start, end)
+                if data.empty:
+                    return data
+                self._write(symbol, data, start, end)
+            else:
+                cached_start = pd.Timestamp(meta["start"])
+                cached_end = pd.Timestamp(meta["end"])
+                if cached_start > start:
+                    # cached for a later end date, the oldest bars are missing
+                    data = self._prepend(symbol, data, start, cached_start, cached_end)
+                if cached_end < end:
+                    tail = self._download(symbol, self._tail_start(meta), end)
+                    data = self._extend(symbol, data, tail, end)
+                if cached_start > start or cached_end < end:
+                    self._write(symbol, data, min(cached_start, start), max(cached_end, end))
+
+        data = data[(data["Date"] >= start) & (data["Date"] < end)]
+        return data.reset_index(drop=True)
+
+    def update(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        data: Annotated[pd.DataFrame, "downloaded bars with a Date column"],
+        start_date: Annotated[str, "first day covered by data"],
+        end_date: Annotated[str, "exclusive end of the range covered by data"],
+    ):
+        """Merge externally downloaded bars for [start_date, end_date) into the cache."""
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        data = self._normalize(data)
+
+        with self._lock(symbol):
+            cached, meta = self._read(symbol)
+            if cached is not None:
+                cached_start = pd.Timestamp(meta["start"])
+                cached_end = pd.Timestamp(meta["end"])
+                # only merge ranges that leave no gap in the covered history
+                if start <= cached_end and end >= cached_start:
+                    data = self._merge(cached, data)
+                    start = min(start, cached_start)
+                    end = max(end, cached_end)
+            self._write(symbol, data, start, end)
+
+    def get_many(
+        self,
+        symbols: Annotated[List[str], "ticker symbols"],
+        end_date: Annotated[
+            Optional[str], "exclusive end of the history, defaults to today"
+        ] = None,
+        batch_size: Annotated[int, "symbols per yf.download call"] = 50,
+        max_workers: Annotated[int, "batches downloaded in parallel"] = 4,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bring the cached history of a whole watchlist up to end_date with batched
+        multi-symbol downloads, then return each symbol's history as get() would.
+        Symbols for which nothing could be downloaded are left out.
+        """
+        end = pd.Timestamp(end_date or pd.Timestamp.today()).normalize()
+        start = end - pd.DateOffset(years=self.history_years)
+        symbols = list(dict.fromkeys(symbols))
+
+        # symbols that need the same download start go in the same batches
+        plans, missing_head = {}, []
+        for symbol in symbols:
+            _, meta = self._read(symbol, meta_only=True)
+            if meta is None:
+                plans.setdefault(start, []).append(symbol)
+            elif pd.Timestamp(meta["start"]) > start:
+                # cached for a later end date, get() fills in both ends
+                missing_head.append(symbol)
+            elif pd.Timestamp(meta["end"]) < end:
+                plans.setdefault(self._tail_start(meta), []).append(symbol)
+
+        batches = [
+            (batch_start, group[i : i + batch_size])
+            for batch_start, group in plans.items()
+            for i in range(0, len(group), batch_size)
+        ]
+
+        def fetch(batch):
+            batch_start, batch_symbols = batch
+            frames = self._download_batch(batch_symbols, batch_start, end)
+            for symbol, frame in frames.items():
+                self._ingest(symbol, frame, start, end)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(fetch, batch) for batch in batches]:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Batched price download failed: {e}")
+            heads = [executor.submit(self.get, symbol, end_date) for symbol in missing_head]
+            for future in heads:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Price download failed: {e}")
+
+        result = {}
+        for symbol in symbols:
+            data, _ = self._read(symbol)
+            if data is not None:
+                data = data[(data["Date"] >= start) & (data["Date"] < end)]
+                result[symbol] = data.reset_index(drop=True)
+        return result
+
+    def collect_garbage(
+        self, symbol: Annotated[Optional[str], "only clean up this symbol"] = None
+    ) -> int:
+        """Remove the legacy per-day ``{symbol}-YFin-data-{start}-{end}.csv`` snapshots."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        removed = 0
+        for file_name in os.listdir(self.cache_dir):
+            match = _SNAPSHOT_RE.match(file_name)
+            if match is None or (symbol is not None and match["symbol"] != symbol):
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _lock(self, symbol):
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _read(self, symbol, meta_only=False):
+        try:
+            with open(self.meta_path(symbol), "r") as f:
+                meta = json.load(f)
+            if meta_only:
+                return None, meta
+            data = pd.read_csv(self.data_path(symbol))
+        except (FileNotFoundError, ValueError):
+            return None, None
+        data["Date"] = pd.to_datetime(data["Date"])
+        return data, meta
+
+    def _write(self, symbol, data, start, end):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._replace(self.data_path(symbol), lambda f: data.to_csv(f, index=False))
+        meta = {
+            "symbol": symbol,
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "updated": pd.Timestamp.now().isoformat(timespec="seconds"),
+        }
+        self._replace(self.meta_path(symbol), lambda f: json.dump(meta, f))
+        self.collect_garbage(symbol)
+
+    def _replace(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", newline="") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _tail_start(meta):
+        return pd.Timestamp(meta["end"]) - pd.DateOffset(days=_OVERLAP_DAYS)
+
+    def _ingest(self, symbol, downloaded, start, end):
+        """Store bars downloaded for [start or the cached tail, end)."""
+        with self._lock(symbol):
+            data, meta = self._read(symbol)
+            if data is None:
+                self._write(symbol, downloaded, start, end)
+            elif pd.Timestamp(meta["end"]) < end:
+                # only the tail was downloaded, the covered start stays
+                data = self._extend(symbol, data, downloaded, end)
+                self._write(symbol, data, pd.Timestamp(meta["start"]), end)
+
+    def _prepend(self, symbol, data, start, cached_start, cached_end):
+        head = self._download(
+            symbol, start, cached_start + pd.DateOffset(days=_OVERLAP_DAYS)
+        )
+        if head.empty:
+            return data
+
+        # prices re-adjusted since the cache was written no longer line up
+        overlap = data.merge(head, on="Date", suffixes=("", "_new"))
+        if not overlap.empty and not np.allclose(
+            overlap["Close"], overlap["Close_new"], rtol=1e-6, equal_nan=True
+        ):
+            return self._download(symbol, start, cached_end)
+
+        return self._merge(head, data)
+
+    def _extend(self, symbol, data, tail, end):
+        if tail.empty:
+            return data
+
+        # auto-adjusted prices are rewritten after splits and dividends, in
+        # which case the cached history no longer lines up with the new bars
+        overlap = data.merge(tail, on="Date", suffixes=("", "_new"))
+        if not overlap.empty and not np.allclose(
+            overlap["Close"], overlap["Close_new"], rtol=1e-6, equal_nan=True
+        ):
+            start = end - pd.DateOffset(years=self.history_years)
+            return self._download(symbol, min(data["Date"].min(), start), end)
+
+        return self._merge(data, tail)
+
+    @staticmethod
+    def _merge(data, new_data):
+        merged = pd.concat([data, new_data], ignore_index=True)
+        merged = merged.drop_duplicates(subset="Date", keep="last")
+        return merged.sort_values("Date").reset_index(drop=True)
+
+    @staticmethod
+    def _normalize(data):
+        if "Date" not in data.columns:
+            data = data.reset_index()
+        data = data.copy()
+        data["Date"] = pd.to_datetime(data["Date"])
+        if data["Date"].dt.tz is not None:
+            data["Date"] = data["Date"].dt.tz_localize(None)
+        return data
+
+    def _download(self, symbol, start, end):
+        data = yf.download(
+            symbol,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        return self._normalize(data)
+
+    def _download_batch(self, symbols, start, end):
+        data = yf.download(
+            symbols,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            group_by="ticker",
+            progress=False,
+            auto_adjust=True,
+            # parallelism is bounded by the batches running at once
+            threads=False,
+        )
+        frames = {}
+        if data.empty:
+            return frames
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[symbol]
+            else:
+                frame = data
+            # shorter histories are padded with empty rows in the joint frame
+            frame = frame.dropna(how="all")
+            if not frame.empty:
+                frame.columns.name = None
+                frames[symbol] = self._normalize(frame)
+        return frames
+
+
+_caches: Dict[str, OnlinePriceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_online_price_cache() -> OnlinePriceCache:
+    """Process-wide OnlinePriceCache for the configured data_cache_dir."""
+    cache_dir = os.path.abspath(get_config()["data_cache_dir"])
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = OnlinePriceCache(cache_dir)
+            _caches[cache_dir] = cache
+        return cache
+
+
+def download_watchlist(
+    symbols: Annotated[List[str], "ticker symbols"],
+    end_date: Annotated[
+        Optional[str], "exclusive end of the history, defaults to today"
+    ] = None,
+    batch_size: Annotated[int, "symbols per yf.download call"] = 50,
+    max_workers: Annotated[int, "batches downloaded in parallel"] = 4,
+) -> Dict[str, pd.DataFrame]:
+    """Batched download of a watchlist into the process-wide OnlinePriceCache."""
+    return get_online_price_cache().get_many(symbols, end_date, batch_size, max_workers)
@@ -0,0 +1,190 @@
+"""
+Columnar, memory-mapped store for the offline Yahoo Finance price CSVs.
+
+Each ``{symbol}-YFin-data-2015-01-01-2025-03-25.csv`` is converted once into a
+directory of ``.npy`` column files plus a datetime64 index. Later reads map the
+columns with ``np.load(mmap_mode="r")`` and slice them by date with a binary
+search on the index, so the cost of a lookup depends on the size of the
+requested window rather than on the size of the file.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Annotated, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+OFFLINE_PRICE_START = "2015-01-01"
+OFFLINE_PRICE_END = "2025-03-25"
+
+_FORMAT_VERSION = 1
+
+
+def offline_price_file(symbol: Annotated[str, "ticker symbol"]) -> str:
+    """File name of the offline Yahoo Finance CSV for a symbol."""
+    return f"{symbol}-YFin-data-{OFFLINE_PRICE_START}-{OFFLINE_PRICE_END}.csv"
+
+
+class PriceTable:
+    """Memory-mapped columns of one converted price file."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.source = meta["source"]
+        self.source_mtime = meta["source_mtime"]
+        self.columns = meta["columns"]
+        self.arrays = {
+            name: np.load(os.path.join(path, f"col_{i}.npy"), mmap_mode="r")
+            for i, name in enumerate(self.columns)
+        }
+        self.index = pd.DatetimeIndex(
+            np.load(os.path.join(path, "index.npy"), mmap_mode="r"), name="Date"
+        )
+
+    def __len__(self):
+        return len(self.index)
+
+    def bounds(self, start_date=None, end_date=None):
+        """Row positions [lo, hi) covering start_date..end_date (inclusive)."""
+        lo = 0
+        hi = len(self.index)
+        if start_date is not None:
+            lo = int(self.index.searchsorted(pd.Timestamp(start_date), side="left"))
+        if end_date is not None:
+            hi = int(self.index.searchsorted(pd.Timestamp(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def slice(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Rows between start_date and end_date (inclusive) in the original CSV
+        layout. The frame index holds the row positions in the source file.
+        """
+        lo, hi = self.bounds(start_date, end_date)
+        return pd.DataFrame(
+            {name: self.arrays[name][lo:hi] for name in self.columns},
+            index=pd.RangeIndex(lo, hi),
+        )
+
+    def dates(self, start_date=None, end_date=None) -> pd.DatetimeIndex:
+        """Trading dates between start_date and end_date (inclusive)."""
+        lo, hi = self.bounds(start_date, end_date)
+        return self.index[lo:hi]
+
+
+class PriceStore:
+    """
+    Converts the price CSVs in ``source_dir`` to memory-mappable columns under
+    ``store_dir`` and serves date-range slices from them. A converted file is
+    rebuilt automatically when its source CSV changes.
+    """
+
+    def __init__(
+        self,
+        source_dir: Annotated[str, "directory holding the price CSVs"],
+        store_dir: Annotated[str, "directory for the converted columns"] = None,
+    ):
+        self.source_dir = source_dir
+        if store_dir is None:
+            store_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+        self.store_dir = store_dir
+        self._tables: Dict[str, PriceTable] = {}
+        self._lock = threading.Lock()
+
+    def table(self, symbol: Annotated[str, "ticker symbol"]) -> PriceTable:
+        """Return the memory-mapped table for a symbol, converting it if needed."""
+        source = os.path.join(self.source_dir, offline_price_file(symbol))
+        # Raises FileNotFoundError like pd.read_csv did for a missing symbol
+        source_mtime = os.path.getmtime(source)
+
+        table = self._tables.get(symbol)
+        if table is not None and table.source_mtime == source_mtime:
+            return table
+
+        with self._lock:
+            table = self._tables.get(symbol)
+            if table is None or table.source_mtime != source_mtime:
+                table = self._open(symbol, source, source_mtime)
+                self._tables[symbol] = table
+            return table
+
+    def get_range(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[Optional[str], "start date, yyyy-mm-dd"] = None,
+        end_date: Annotated[Optional[str], "end date, yyyy-mm-dd"] = None,
+    ) -> pd.DataFrame:
+        """Rows for symbol between start_date and end_date (inclusive)."""
+        return self.table(symbol).slice(start_date, end_date)
+
+    def _open(self, symbol, source, source_mtime) -> PriceTable:
+        path = os.path.join(self.store_dir, os.path.splitext(offline_price_file(symbol))[0])
+        if os.path.exists(os.path.join(path, "meta.json")):
+            table = PriceTable(path)
+            if table.source == os.path.abspath(source) and table.source_mtime == source_mtime:
+                return table
+        self._convert(source, source_mtime, path)
+        return PriceTable(path)
+
+    def _convert(self, source, source_mtime, path):
+        data = pd.read_csv(source)
+
+        index = pd.to_datetime(data["Date"].astype(str).str[:10]).values.astype(
+            "datetime64[ns]"
+        )
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self.store_dir)
+        try:
+            np.save(os.path.join(tmp_path, "index.npy"), index)
+            for i, name in enumerate(data.columns):
+                values = data[name].to_numpy()
+                if values.dtype == object:
+                    values = values.astype(str)
+                np.save(os.path.join(tmp_path, f"col_{i}.npy"), values)
+
+            with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+                json.dump(
+                    {
+                        "version": _FORMAT_VERSION,
+                        "source": os.path.abspath(source),
+                        "source_mtime": source_mtime,
+                        "columns": list(data.columns),
+                    },
+                    f,
+                )
+
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.replace(tmp_path, path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+
+_stores: Dict[tuple, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store(
+    source_dir: Annotated[str, "directory holding the price CSVs"],
+) -> PriceStore:
+    """Process-wide PriceStore for a source directory."""
+    key = (
+        os.path.abspath(source_dir),
+        os.path.abspath(get_config()["data_cache_dir"]),
+    )
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = PriceStore(source_dir)
+            _stores[key] = store
+        return store
@@ -1,11 +1,17 @@
 import requests
 import time
 import json
+import hashlib
+import threading
 from datetime import datetime, timedelta
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Annotated
 import os
 import re
+from .config import get_config
+from .china_hk_utils import CHINA_HK_TICKERS
+from .company_matcher import CompanyMatcher, build_company_aliases
 
 ticker_to_company = {
     # 美股
@@ -83,74 +89,188 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+class RedditIndex:
+    """
+    Byte offsets of the posts in ``<data_path>/<category>/*.jsonl``, grouped by
+    the UTC date they were created on. The index is built once per file and
+    saved under ``index_dir``; it is refreshed for files whose size or mtime
+    changed, so a date range query only reads the lines inside the window.
+    """
+
+    def __init__(self, data_path, category, index_dir):
+        self.data_path = data_path
+        self.category = category
+        self.index_path = os.path.join(
+            index_dir, f"{category}-{_path_digest(data_path)}.json"
+        )
+        self.files = {}
+
+    def refresh(self):
+        """Re-index the files that were added or changed since the last build."""
+        category_dir = os.path.join(self.data_path, self.category)
+        if not self.files and os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                self.files = json.load(f)["files"]
+
+        changed = False
+        current = {}
+        for data_file in os.listdir(category_dir):
+            if not data_file.endswith(".jsonl"):
+                continue
+            stat = os.stat(os.path.join(category_dir, data_file))
+            entry = self.files.get(data_file)
+            if (
+                entry is None
+                or entry["size"] != stat.st_size
+                or entry["mtime"] != stat.st_mtime
+            ):
+                entry = {
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "dates": self._index_file(os.path.join(category_dir, data_file)),
+                }
+                changed = True
+            current[data_file] = entry
+
+        changed = changed or len(current) != len(self.files)
+        self.files = current
+        if changed:
+            self._save()
+
+    def read_range(self, data_file, dates):
+        """Parsed posts of data_file created on any of dates, grouped by date."""
+        spans = []
+        file_dates = self.files[data_file]["dates"]
+        for date in dates:
+            for offset, length in file_dates.get(date, []):
+                spans.append((offset, length, date))
+        spans.sort()
+
+        posts = {date: [] for date in dates}
+        with open(os.path.join(self.data_path, self.category, data_file), "rb") as f:
+            for offset, length, date in spans:
+                f.seek(offset)
+                posts[date].append(json.loads(f.read(length)))
+        return posts
+
+    @staticmethod
+    def _index_file(file_path):
+        dates = {}
+        offset = 0
+        with open(file_path, "rb") as f:
+            for line in f:
+                length = len(line)
+                # skip empty lines
+                if line.strip():
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(
+                        parsed_line["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    dates.setdefault(post_date, []).append([offset, length])
+                offset += length
+        return dates
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"data_path": self.data_path, "files": self.files}, f)
+        os.replace(tmp_path, self.index_path)
+
+
+def _path_digest(path):
+    return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_reddit_index(data_path, category):
+    """Process-wide, up to date RedditIndex for a category."""
+    key = (os.path.abspath(data_path), category)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = RedditIndex(
+                data_path,
+                category,
+                os.path.join(get_config()["data_cache_dir"], "reddit_index"),
+            )
+            _indexes[key] = index
+        index.refresh()
+        return index
+
+
+company_aliases = build_company_aliases(ticker_to_company, CHINA_HK_TICKERS)
+
+
+def get_company_matcher(tickers):
+    """CompanyMatcher over the reddit and China/HK alias tables for tickers."""
+    return _get_company_matcher(tuple(tickers))
+
+
+@lru_cache(maxsize=64)
+def _get_company_matcher(tickers):
+    return CompanyMatcher(company_aliases, tickers)
+
+
+def fetch_company_posts_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
-    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    queries: Annotated[
+        list, "Tickers to search for in the subreddit, None for no filtering."
+    ],
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
+    """
+    Top posts for every day from start_date to end_date (inclusive) and every
+    query in a single pass over the indexed category. Each post is tagged with
+    all the tickers it mentions at once, so a whole watchlist costs one scan.
+    Returns a dict query -> posts, where the posts of each query are the same
+    as calling fetch_top_from_category once per day and concatenating them.
+    """
     base_path = data_path
 
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    num_files = len(os.listdir(os.path.join(base_path, category)))
+    if max_limit < num_files:
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // num_files
+
+    dates = []
+    curr_date = datetime.strptime(start_date, "%Y-%m-%d")
+    last_date = datetime.strptime(end_date, "%Y-%m-%d")
+    while curr_date <= last_date:
+        dates.append(curr_date.strftime("%Y-%m-%d"))
+        curr_date += timedelta(days=1)
 
+    queries = list(dict.fromkeys(queries))
+    # if is company_news, only keep posts whose title or content mention the company (query)
+    tickers = [query for query in queries if query] if "company" in category else []
+    matcher = get_company_matcher(tickers) if tickers else None
+
+    index = get_reddit_index(base_path, category)
+
+    top_per_date = {query: {date: [] for date in dates} for query in queries}
     for data_file in os.listdir(os.path.join(base_path, category)):
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
+        for post_date, parsed_lines in index.read_range(data_file, dates).items():
+            content_curr_subreddit = {query: [] for query in queries}
 
+            for parsed_line in parsed_lines:
                 post = {
                     "title": parsed_line["title"],
                     "content": parsed_line["selftext"],
@@ -159,11 +279,65 @@ def fetch_top_from_category(
                     "posted_date": post_date,
                 }
 
-                all_content_curr_subreddit.append(post)
+                mentioned = set()
+                if matcher is not None:
+                    mentioned.update(
+                        matcher.tag(parsed_line["title"], parsed_line["selftext"])
+                    )
+                for query in queries:
+                    if query in tickers and query not in mentioned:
+                        continue
+                    content_curr_subreddit[query].append(post)
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+            for query, posts in content_curr_subreddit.items():
+                # sort posts by upvote_ratio in descending order
+                posts.sort(key=lambda x: x["upvotes"], reverse=True)
+                top_per_date[query][post_date].extend(posts[:limit_per_subreddit])
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+    all_content = {}
+    for query in queries:
+        all_content[query] = []
+        for date in dates:
+            all_content[query].extend(top_per_date[query][date])
 
     return all_content
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """
+    Top posts for every day from start_date to end_date (inclusive) in a single
+    pass over the indexed category. The result is the same as calling
+    fetch_top_from_category once per day and concatenating the results.
+    """
+    return fetch_company_posts_range(
+        category, start_date, end_date, max_limit, [query], data_path=data_path
+    )[query]
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path=data_path
+    )
@@ -0,0 +1,128 @@
+"""
+Persistent cache of the web-search LLM tool responses.
+
+Responses are stored in SQLite keyed by a hash of (model, backend, prompt,
+date). Answers about past dates cannot change and are kept for good, answers
+about the current day expire after a short TTL. Concurrent callers asking for
+the same key wait for a single in-flight request instead of each paying for it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from typing import Annotated, Callable, Dict
+
+from .config import get_config
+
+# How long a response about today (or a later date) is reused
+RESPONSE_CACHE_TTL_CURRENT = 30 * 60
+
+
+def response_key(model, backend_url, prompt, curr_date):
+    payload = json.dumps([model, backend_url, prompt, curr_date])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with single-flight request sharing."""
+
+    def __init__(self, db_path: Annotated[str, "path of the SQLite database"]):
+        self.db_path = db_path
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, curr_date TEXT, response TEXT, "
+                "created REAL, expires REAL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str):
+        """Cached response for key, None if missing or expired."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key: str, curr_date: str, response: str):
+        now = time.time()
+        # answers about past dates are immutable, those about today are not
+        if curr_date < date.today().strftime("%Y-%m-%d"):
+            expires = None
+        else:
+            expires = now + RESPONSE_CACHE_TTL_CURRENT
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, curr_date, response, now, expires),
+            )
+
+    def get_or_compute(
+        self,
+        key: Annotated[str, "see response_key()"],
+        curr_date: Annotated[str, "date the prompt is about, yyyy-mm-dd"],
+        compute: Annotated[Callable[[], str], "produces the response on a miss"],
+    ) -> str:
+        response = self.get(key)
+        if response is not None:
+            return response
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            response = compute()
+            self.put(key, curr_date, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self, expired_only: Annotated[bool, "only drop expired entries"] = False):
+        with self._connect() as conn:
+            if expired_only:
+                conn.execute(
+                    "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+                    (time.time(),),
+                )
+            else:
+                conn.execute("DELETE FROM responses")
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide ResponseCache in the configured data_cache_dir."""
+    db_path = os.path.abspath(
+        os.path.join(get_config()["data_cache_dir"], "llm_responses.sqlite")
+    )
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = ResponseCache(db_path)
+            _caches[db_path] = cache
+        return cache
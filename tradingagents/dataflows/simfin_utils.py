@@ -0,0 +1,161 @@
+"""
+Process-wide cache of the SimFin fundamentals statements.
+
+Each statement file is parsed once, sorted by ticker and publish date, and
+kept in memory. "Latest statement published on or before a date" lookups are
+then a binary search within the ticker's rows instead of a full re-read.
+"""
+
+import os
+import threading
+from typing import Annotated, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# statement name -> (directory under simfin_data_all, file name template)
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance-{freq}.csv"),
+    "cash_flow": ("cash_flow", "us-cashflow-{freq}.csv"),
+    "income_statements": ("income_statements", "us-income-{freq}.csv"),
+}
+
+
+def simfin_data_path(
+    data_dir: Annotated[str, "root data directory"],
+    statement: Annotated[str, "balance_sheet, cash_flow or income_statements"],
+    freq: Annotated[str, "annual / quarterly"],
+) -> str:
+    folder, file_name = SIMFIN_STATEMENTS[statement]
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        folder,
+        "companies",
+        "us",
+        file_name.format(freq=freq),
+    )
+
+
+class SimFinStatements:
+    """One SimFin statement file, parsed once and grouped by ticker."""
+
+    def __init__(self, data_path: Annotated[str, "path of the SimFin csv file"]):
+        df = pd.read_csv(data_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # a stable sort keeps rows published on the same day in file order
+        self.frame = df.sort_values(["Ticker", "Publish Date"], kind="stable")
+        self.publish_dates = self.frame["Publish Date"].values
+
+        tickers = self.frame["Ticker"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        ends = np.r_[starts[1:], len(tickers)]
+        self.ticker_rows = {
+            tickers[lo]: (int(lo), int(hi)) for lo, hi in zip(starts, ends)
+        }
+
+    def latest_positions(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        trade_dates: Annotated[list, "trade dates, yyyy-mm-dd"],
+    ) -> np.ndarray:
+        """
+        Row positions in ``frame`` of the most recent statement published on or
+        before each trade date, with -1 where there is none.
+        """
+        dates = pd.to_datetime(pd.Index(trade_dates), utc=True).normalize()
+        rows = self.ticker_rows.get(ticker)
+        if rows is None:
+            return np.full(len(dates), -1, dtype=np.int64)
+        lo, hi = rows
+
+        publish_dates = self.publish_dates[lo:hi]
+        pos = np.searchsorted(publish_dates, dates.values, side="right") - 1
+        found = pos >= 0
+
+        # like idxmax, prefer the first row among those sharing the latest date
+        first = np.searchsorted(
+            publish_dates, publish_dates[np.maximum(pos, 0)], side="left"
+        )
+        return np.where(found, lo + first, -1).astype(np.int64)
+
+    def latest_position(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> int:
+        """Row position of the latest statement as of curr_date, or -1."""
+        return int(self.latest_positions(ticker, [curr_date])[0])
+
+    def row_ids(self, positions: Annotated[np.ndarray, "row positions"]) -> pd.array:
+        """Map row positions to the row ids of the source file (<NA> for -1)."""
+        positions = np.asarray(positions)
+        ids = self.frame.index.to_numpy()[np.maximum(positions, 0)]
+        return pd.array(np.where(positions >= 0, ids, pd.NA), dtype="Int64")
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Most recent statement published on or before curr_date, or None."""
+        pos = self.latest_position(ticker, curr_date)
+        if pos < 0:
+            return None
+        return self.frame.iloc[pos]
+
+
+_statements: Dict[str, SimFinStatements] = {}
+_statements_lock = threading.Lock()
+
+
+def get_simfin_statements(
+    data_dir: Annotated[str, "root data directory"],
+    statement: Annotated[str, "balance_sheet, cash_flow or income_statements"],
+    freq: Annotated[str, "annual / quarterly"],
+) -> SimFinStatements:
+    """Load a statement file on first use and share it across callers."""
+    data_path = os.path.abspath(simfin_data_path(data_dir, statement, freq))
+
+    statements = _statements.get(data_path)
+    if statements is None:
+        with _statements_lock:
+            statements = _statements.get(data_path)
+            if statements is None:
+                statements = SimFinStatements(data_path)
+                _statements[data_path] = statements
+    return statements
+
+
+def get_simfin_asof_index(
+    data_dir: Annotated[str, "root data directory"],
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[str, "annual / quarterly"],
+    trade_dates: Annotated[list, "trade dates, yyyy-mm-dd"],
+) -> pd.DataFrame:
+    """
+    Point-in-time index of the SimFin statements for many trade dates at once.
+
+    Returns a DataFrame indexed by trade date with one column per statement
+    family (see SIMFIN_STATEMENTS) holding the row id, in the source file, of
+    the latest statement published on or before that date (<NA> if none).
+    """
+    trade_dates = [str(trade_date)[:10] for trade_date in trade_dates]
+    index = pd.DataFrame(index=pd.Index(trade_dates, name="trade_date"))
+    for statement in SIMFIN_STATEMENTS:
+        statements = get_simfin_statements(data_dir, statement, freq)
+        index[statement] = statements.row_ids(
+            statements.latest_positions(ticker, trade_dates)
+        )
+    return index
+
+
+def clear_simfin_cache():
+    """Drop every parsed statement file, e.g. after the SimFin data is refreshed."""
+    with _statements_lock:
+        _statements.clear()
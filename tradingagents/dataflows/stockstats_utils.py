@@ -1,21 +1,15 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
-import os
-from .config import get_config
+from .price_store import get_price_store
+from .price_cache import get_online_price_cache
+from .china_hk_provider import china_hk_market, get_china_hk_provider
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def get_stock_data(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -25,57 +19,56 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
-
+        """Load the price history for symbol and wrap it with stockstats."""
         if not online:
             try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
+                data = get_price_store(data_dir).get_range(symbol)
                 df = wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+            price_cache = get_online_price_cache()
+            data = None
+            if china_hk_market(symbol) is not None:
+                # the forward-adjusted bars the CN/HK price tool reports
+                end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+                start = end - pd.DateOffset(years=price_cache.history_years)
+                try:
+                    data = get_china_hk_provider().symbol_history(
+                        symbol, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), adjusted=True
+                    ).reset_index()
+                except Exception as e:
+                    print(f"CN/HK provider failed for {symbol}, using Yahoo Finance: {e}")
+            if data is None or data.empty:
+                # Cached history of the last 15 years, extended with the missing tail bars
+                data = price_cache.get(symbol)
 
             df = wrap(data)
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+
+        return df
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        df = StockstatsUtils.get_stock_data(symbol, data_dir, online)
+        if online:
+            curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
@@ -85,3 +78,41 @@ class StockstatsUtils:
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            list, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "start date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "end date of the window, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        """
+        Compute indicators over the whole history once and return their values
+        for the trading days between start_date and end_date (inclusive), as a
+        DataFrame indexed by YYYY-mm-dd date strings with one column per indicator.
+        """
+        if isinstance(indicators, str):
+            indicators = [indicators]
+
+        df = StockstatsUtils.get_stock_data(symbol, data_dir, online)
+        for indicator in indicators:
+            df[indicator]  # trigger stockstats to calculate the indicator
+
+        # rows are in chronological order, so the window is a contiguous slice
+        dates = pd.DatetimeIndex(pd.to_datetime(df["Date"].astype(str).str[:10]))
+        lo = dates.searchsorted(pd.Timestamp(start_date), side="left")
+        hi = dates.searchsorted(pd.Timestamp(end_date), side="right")
+
+        window = pd.DataFrame(df[indicators].iloc[lo:hi])
+        window.index = dates[lo:hi].strftime("%Y-%m-%d")
+        return window
@@ -0,0 +1,291 @@
+"""
+Pluggable data vendors with fallback and hedged requests.
+
+Every data kind (prices, news, fundamentals, insider) has an ordered list of
+backends sharing one call signature. A call starts the best-ranked backend;
+if it fails the next one starts at once, and if it is still running when the
+kind's deadline passes the next one is started alongside it (a hedged
+request). The first usable result wins. Backends are ranked by their observed
+latency and error rate, with the configured order breaking ties.
+
+Only backends that answer the same question with the same result type belong
+in one router, as any of them may win a call. By default prices have two:
+the CN/HK provider, which answers .SS/.SZ/.HK symbols and passes on the rest,
+ahead of Yahoo Finance. The other kinds have a single backend, as the offline
+price snapshot, Finnhub's ticker-only news and the SimFin statements are not
+equivalent to the online tools they would stand in for; a router with a single
+backend calls it directly. Equivalent alternatives are added with
+register_vendor.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Annotated, Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from . import interface
+
+# Seconds to wait on a backend before hedging with the next one
+VENDOR_DEADLINES = {
+    "prices": 10.0,
+    "news": 20.0,
+    "fundamentals": 60.0,
+    "insider": 10.0,
+}
+# Seconds of latency an error counts for when ranking backends
+VENDOR_ERROR_PENALTY = 30.0
+# Weight of the latest observation in the moving averages
+VENDOR_STATS_ALPHA = 0.2
+# Starts of the strings backends return when they have nothing for a call
+EMPTY_RESULT_PREFIXES = ("No data found",)
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="vendor")
+
+
+def is_empty(result) -> bool:
+    """Results that should fall through to the next backend."""
+    if result is None:
+        return True
+    if isinstance(result, pd.DataFrame):
+        return result.empty
+    if isinstance(result, str):
+        result = result.strip()
+        return not result or result.startswith(EMPTY_RESULT_PREFIXES)
+    return False
+
+
+class VendorStats:
+    """
+    Moving averages of a backend's latency and error rate. Empty results are
+    counted on their own and left out of the averages, having no data for a
+    call is no sign of a slow or broken backend.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.empty = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, failed, empty=False):
+        with self._lock:
+            if empty:
+                # a backend passing on a call says nothing about how it serves the others
+                pass
+            elif self.calls == self.empty:
+                self.latency = seconds
+                self.error_rate = float(failed)
+            else:
+                self.latency += VENDOR_STATS_ALPHA * (seconds - self.latency)
+                self.error_rate += VENDOR_STATS_ALPHA * (float(failed) - self.error_rate)
+            self.calls += 1
+            self.errors += int(failed)
+            self.empty += int(empty)
+
+    def score(self):
+        return self.latency + self.error_rate * VENDOR_ERROR_PENALTY
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "empty": self.empty,
+            "latency": round(self.latency, 3),
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class Vendor:
+    """A named backend for one data kind."""
+
+    def __init__(self, name: str, fetch: Callable[..., Any]):
+        self.name = name
+        self.fetch = fetch
+        self.stats = VendorStats()
+
+    def __call__(self, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            result = self.fetch(*args, **kwargs)
+        except Exception:
+            self.stats.record(time.monotonic() - start, True)
+            raise
+        self.stats.record(time.monotonic() - start, False, is_empty(result))
+        return result
+
+
+class VendorRouter:
+    """Ordered backends of one data kind with deadline-triggered hedging."""
+
+    def __init__(
+        self,
+        kind: Annotated[str, "data kind, e.g. prices"],
+        deadline: Annotated[Optional[float], "seconds before hedging, None to never hedge"] = None,
+    ):
+        self.kind = kind
+        self.deadline = deadline
+        self.vendors: List[Vendor] = []
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: Annotated[str, "backend name"],
+        fetch: Annotated[Callable[..., Any], "backend function"],
+        first: Annotated[bool, "put the backend ahead of the others"] = False,
+    ):
+        with self._lock:
+            self.vendors = [vendor for vendor in self.vendors if vendor.name != name]
+            vendor = Vendor(name, fetch)
+            if first:
+                self.vendors.insert(0, vendor)
+            else:
+                self.vendors.append(vendor)
+
+    def unregister(self, name: Annotated[str, "backend name"]):
+        with self._lock:
+            self.vendors = [vendor for vendor in self.vendors if vendor.name != name]
+
+    def ranked(self) -> List[Vendor]:
+        """Backends by observed cost, unused ones keep their configured position."""
+        with self._lock:
+            vendors = list(self.vendors)
+        # an unused backend ranks like the backend configured before it
+        scores, score = {}, 0.0
+        for vendor in vendors:
+            if vendor.stats.calls:
+                score = vendor.stats.score()
+            scores[vendor.name] = score
+        return sorted(vendors, key=lambda vendor: scores[vendor.name])
+
+    def fetch(self, *args, **kwargs):
+        """
+        First usable result of the backends, in ranked order. When every backend
+        fails, the last empty result is returned, or the last error is raised.
+        """
+        pending = list(self.ranked())
+        if not pending:
+            raise LookupError(f"No vendor registered for {self.kind}")
+        if len(pending) == 1:
+            # nothing to fall back to or hedge with
+            return pending[0](*args, **kwargs)
+
+        running = {}
+        last_result, last_error = None, None
+
+        def start_next():
+            vendor = pending.pop(0)
+            running[_executor.submit(vendor, *args, **kwargs)] = vendor
+
+        start_next()
+        while running:
+            timeout = self.deadline if pending and self.deadline is not None else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # deadline passed, hedge with the next backend
+                start_next()
+                continue
+
+            for future in done:
+                running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if not is_empty(result):
+                    return result
+                last_result = result
+
+            if not running and pending:
+                start_next()
+
+        if last_result is not None or last_error is None:
+            return last_result
+        raise last_error
+
+    def stats(self) -> Dict[str, dict]:
+        return {vendor.name: vendor.stats.as_dict() for vendor in self.ranked()}
+
+
+class LocalFileVendor:
+    """
+    File-backed stand-in backend, e.g. for tests: the result of a call is the
+    content of ``{root}/{kind}/{args}.txt``, a missing file is an error.
+    """
+
+    def __init__(
+        self,
+        root: Annotated[str, "directory holding the recorded results"],
+        kind: Annotated[str, "data kind"],
+    ):
+        self.root = root
+        self.kind = kind
+
+    def path(self, *args):
+        name = "__".join(re.sub(r"[^\w.-]+", "_", str(arg)) for arg in args)
+        return os.path.join(self.root, self.kind, f"{name}.txt")
+
+    def __call__(self, *args):
+        with open(self.path(*args), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def save(self, result: str, *args):
+        """Record result as the answer to a call with args."""
+        path = self.path(*args)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(result)
+
+
+def _default_routers():
+    routers = {kind: VendorRouter(kind, deadline) for kind, deadline in VENDOR_DEADLINES.items()}
+    # prices: (symbol, start_date, end_date)
+    routers["prices"].register("china_hk", interface.get_china_hk_data_online)
+    routers["prices"].register("yfinance", interface.get_YFin_data_online)
+    # news: (query, curr_date, look_back_days), query is free text
+    routers["news"].register("google", interface.get_google_news)
+    # fundamentals: (ticker, curr_date)
+    routers["fundamentals"].register("openai", interface.get_fundamentals_openai)
+    # insider: (ticker, curr_date, look_back_days)
+    routers["insider"].register(
+        "finnhub", interface.get_finnhub_company_insider_transactions
+    )
+    return routers
+
+
+_routers: Dict[str, VendorRouter] = _default_routers()
+
+
+def get_vendor_router(kind: Annotated[str, "data kind"]) -> VendorRouter:
+    return _routers[kind]
+
+
+def register_vendor(
+    kind: Annotated[str, "data kind"],
+    name: Annotated[str, "backend name"],
+    fetch: Annotated[Callable[..., Any], "backend function"],
+    first: Annotated[bool, "put the backend ahead of the others"] = False,
+):
+    _routers[kind].register(name, fetch, first)
+
+
+def use_local_vendors(root: Annotated[str, "directory holding the recorded results"]):
+    """Serve every data kind from LocalFileVendor files under root first."""
+    for kind, router in _routers.items():
+        router.register("local", LocalFileVendor(root, kind), first=True)
+
+
+def fetch(kind: Annotated[str, "data kind"], *args, **kwargs):
+    """Fetch data of a kind through its vendors."""
+    return _routers[kind].fetch(*args, **kwargs)
+
+
+def vendor_stats() -> Dict[str, Dict[str, dict]]:
+    """Latency and error statistics of every backend, by data kind."""
+    return {kind: router.stats() for kind, router in _routers.items()}
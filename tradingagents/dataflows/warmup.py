@@ -0,0 +1,180 @@
+"""
+Warm-up of the dataflow caches for a watchlist.
+
+Meant to run before the first analysis of the day (e.g. from a nightly job via
+``python -m cli.main warmup``): every source's cache is filled for the given
+tickers and date by a bounded worker pool, and the time spent and the failures
+are reported per source. All caches involved are idempotent, so re-running a
+warm-up only refreshes what went stale.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Annotated, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from . import interface
+from .china_hk_provider import china_hk_market, get_china_hk_provider
+from .config import get_config
+from .finnhub_utils import get_data_path, get_finnhub_loader
+from .price_cache import download_watchlist, get_online_price_cache
+from .price_store import get_price_store
+from .reddit_utils import get_reddit_index
+from .simfin_utils import SIMFIN_STATEMENTS, get_simfin_statements
+from .yfin_utils import warm_ticker_cache
+
+ONLINE_SOURCES = ["prices", "china_hk", "metadata", "google_news"]
+OFFLINE_SOURCES = ["prices", "finnhub", "reddit", "simfin"]
+# Paid web-search completions, only warmed when asked for explicitly
+OPTIONAL_SOURCES = ["web_search"]
+
+FINNHUB_DATA_TYPES = ["news_data", "insider_senti", "insider_trans"]
+
+
+def _plan(tickers, trade_date, online, sources, look_back_days):
+    """(source, label, function) tasks of a warm-up."""
+    data_dir = get_config()["data_dir"]
+    next_day = (datetime.strptime(trade_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    start_date = (datetime.strptime(trade_date, "%Y-%m-%d") - timedelta(days=look_back_days)).strftime("%Y-%m-%d")
+    us_tickers = [ticker for ticker in tickers if china_hk_market(ticker) is None]
+    cn_hk_tickers = [ticker for ticker in tickers if china_hk_market(ticker) is not None]
+    tasks = []
+
+    def add(source, label, function, *args):
+        if source in sources:
+            tasks.append((source, label, lambda: function(*args)))
+
+    if online:
+        if us_tickers:
+            add("prices", "watchlist", _download_prices, us_tickers, next_day)
+        if cn_hk_tickers and get_china_hk_provider().tushare_token:
+            # one market snapshot per day serves every ticker of the market
+            markets = sorted({china_hk_market(ticker) for ticker in cn_hk_tickers})
+            for market in markets:
+                for day in pd.bdate_range(start_date, trade_date).strftime("%Y-%m-%d"):
+                    add("china_hk", f"{market}/{day}", _warm_snapshot, market, day)
+        for ticker in cn_hk_tickers:
+            add("china_hk", ticker, _warm_china_hk_history, ticker, next_day)
+        add("metadata", "watchlist", _warm_metadata, tickers)
+        for ticker in tickers:
+            add("google_news", ticker, interface.get_google_news, ticker, trade_date, 7, True)
+        add("web_search", "global", interface.get_global_news_openai, trade_date)
+        for ticker in tickers:
+            add("web_search", ticker, interface.get_stock_news_openai, ticker, trade_date)
+            add("web_search", ticker, interface.get_fundamentals_openai, ticker, trade_date)
+    else:
+        price_dir = os.path.join(data_dir, "market_data", "price_data")
+        for ticker in tickers:
+            add("prices", ticker, get_price_store(price_dir).table, ticker)
+            for data_type in FINNHUB_DATA_TYPES:
+                add(
+                    "finnhub",
+                    f"{ticker}/{data_type}",
+                    _convert_finnhub,
+                    get_data_path(ticker, data_type, data_dir),
+                )
+        for category in ["global_news", "company_news"]:
+            add("reddit", category, get_reddit_index, os.path.join(data_dir, "reddit_data"), category)
+        for statement in SIMFIN_STATEMENTS:
+            for freq in ["quarterly", "annual"]:
+                add("simfin", f"{statement}/{freq}", get_simfin_statements, data_dir, statement, freq)
+    return tasks
+
+
+def _download_prices(tickers, end_date):
+    prices = download_watchlist(tickers, end_date)
+    missing = [ticker for ticker in tickers if ticker not in prices]
+    if missing:
+        raise RuntimeError(f"no prices for {', '.join(missing)}")
+
+
+def _warm_snapshot(market, trade_date):
+    if get_china_hk_provider().snapshot(market, trade_date) is None:
+        raise RuntimeError(f"no {market} snapshot source for {trade_date}")
+
+
+def _warm_china_hk_history(ticker, end_date):
+    # the per-symbol history the CN/HK indicators are computed from
+    provider = get_china_hk_provider()
+    start = pd.Timestamp(end_date) - pd.DateOffset(years=get_online_price_cache().history_years)
+    data = provider.symbol_history(ticker, start.strftime("%Y-%m-%d"), end_date)
+    covered = provider.history_range(ticker)
+    # today's bar is only cached once the session has closed
+    settled_end = min(pd.Timestamp(end_date), pd.Timestamp.today().normalize() - pd.Timedelta(days=1))
+    if covered is None or covered[0] > start or covered[1] < settled_end:
+        raise RuntimeError(f"history of {ticker} not cached, akshare is not available")
+    if data.empty:
+        raise RuntimeError(f"no prices for {ticker}")
+
+
+def _warm_metadata(tickers):
+    failures = warm_ticker_cache(tickers)
+    if failures:
+        raise RuntimeError(
+            "; ".join(f"{ticker}: {', '.join(fields)}" for ticker, fields in failures.items())
+        )
+
+
+def _convert_finnhub(data_path):
+    loader = get_finnhub_loader()
+    sqlite_path = loader.sqlite_path(data_path)
+    # converted files are reused as long as the source has not changed
+    if os.path.exists(sqlite_path) and os.path.getmtime(sqlite_path) >= os.path.getmtime(data_path):
+        return sqlite_path
+    return loader.convert(data_path)
+
+
+def warm_up(
+    tickers: Annotated[List[str], "watchlist ticker symbols"],
+    trade_date: Annotated[str, "date the analyses will run for, yyyy-mm-dd"],
+    online: Annotated[Optional[bool], "warm the online sources, defaults to online_tools"] = None,
+    sources: Annotated[Optional[List[str]], "sources to warm, defaults to all but paid ones"] = None,
+    max_workers: Annotated[int, "tasks run in parallel"] = 8,
+    look_back_days: Annotated[int, "days of history before trade_date"] = 30,
+    progress: Annotated[Optional[Callable[[str, str, Optional[str]], None]], "progress(source, label, error)"] = None,
+) -> Dict[str, dict]:
+    """
+    Fill every dataflow cache for tickers on trade_date.
+
+    Returns, per source, the number of tasks, the summed task seconds, the wall
+    time until the source's last task finished and the failures by task label.
+    """
+    if online is None:
+        online = get_config()["online_tools"]
+    if sources is None:
+        sources = ONLINE_SOURCES if online else OFFLINE_SOURCES
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+
+    tasks = _plan(tickers, trade_date, online, sources, look_back_days)
+    report = {
+        source: {"tasks": 0, "seconds": 0.0, "wall_seconds": 0.0, "failures": {}}
+        for source, _, _ in tasks
+    }
+    started = time.monotonic()
+
+    def run(task):
+        source, label, function = task
+        start = time.monotonic()
+        try:
+            function()
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return source, label, error, time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in as_completed([executor.submit(run, task) for task in tasks]):
+            source, label, error, seconds = future.result()
+            entry = report[source]
+            entry["tasks"] += 1
+            entry["seconds"] += seconds
+            entry["wall_seconds"] = time.monotonic() - started
+            if error is not None:
+                entry["failures"][label] = error
+            if progress is not None:
+                progress(source, label, error)
+
+    return report
@@ -1,20 +1,148 @@
 # gets data/stats
 
+import threading
+import time
 import yfinance as yf
-from typing import Annotated, Callable, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, Any, Dict, Iterable, List, Optional
 from pandas import DataFrame
 import pandas as pd
 from functools import wraps
 
 from .utils import save_output, SavePathType, decorate_all_methods
 
+# Seconds each memoized Ticker field stays fresh
+TICKER_FIELD_TTLS = {
+    "info": 6 * 3600,
+    "financials": 24 * 3600,
+    "balance_sheet": 24 * 3600,
+    "cashflow": 24 * 3600,
+    "dividends": 12 * 3600,
+    "recommendations": 6 * 3600,
+}
+
+
+class CachedTicker:
+    """
+    Stands in for a yf.Ticker: the fields in TICKER_FIELD_TTLS are served from
+    the TickerCache, every other attribute comes from the shared yf.Ticker.
+    """
+
+    def __init__(self, cache: "TickerCache", symbol: str):
+        self._cache = cache
+        self._symbol = symbol
+
+    def __getattr__(self, name):
+        if name in TICKER_FIELD_TTLS:
+            return self._cache.get(self._symbol, name)
+        return getattr(self._cache.ticker(self._symbol), name)
+
+
+class TickerCache:
+    """
+    One yf.Ticker per symbol with its metadata and statements memoized under
+    per-field TTLs. Returned objects are shared and must not be modified.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = dict(TICKER_FIELD_TTLS, **(ttls or {}))
+        self._tickers: Dict[str, yf.Ticker] = {}
+        self._fields: Dict[tuple, tuple] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _symbol_lock(self, symbol):
+        with self._lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def ticker(self, symbol: Annotated[str, "ticker symbol"]) -> yf.Ticker:
+        with self._lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol)
+                self._tickers[symbol] = ticker
+            return ticker
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        field: Annotated[str, "one of TICKER_FIELD_TTLS"],
+    ) -> Any:
+        """Memoized ticker field, fetched again once its TTL has passed."""
+        with self._symbol_lock(symbol):
+            cached = self._fields.get((symbol, field))
+            if cached is not None and cached[1] > time.monotonic():
+                return cached[0]
+
+            if cached is not None:
+                # yf.Ticker keeps its own copy of fetched data, start afresh
+                with self._lock:
+                    self._tickers[symbol] = yf.Ticker(symbol)
+            value = getattr(self.ticker(symbol), field)
+            self._fields[(symbol, field)] = (value, time.monotonic() + self.ttls[field])
+            return value
+
+    def wrap(self, symbol: Annotated[str, "ticker symbol"]) -> CachedTicker:
+        return CachedTicker(self, symbol)
+
+    def warm(
+        self,
+        symbols: Annotated[Iterable[str], "ticker symbols"],
+        fields: Annotated[Optional[List[str]], "fields, defaults to all"] = None,
+        max_workers: Annotated[int, "parallel fetches"] = 8,
+    ) -> Dict[str, List[str]]:
+        """Fetch fields for many symbols in parallel; returns the failures per symbol."""
+        fields = list(fields or self.ttls)
+        jobs = [(symbol, field) for symbol in dict.fromkeys(symbols) for field in fields]
+
+        def fetch(job):
+            try:
+                self.get(*job)
+                return None
+            except Exception:
+                return job
+
+        failures: Dict[str, List[str]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for failed in executor.map(fetch, jobs):
+                if failed is not None:
+                    failures.setdefault(failed[0], []).append(failed[1])
+        return failures
+
+    def invalidate(self, symbol: Annotated[Optional[str], "symbol, None for all"] = None):
+        with self._lock:
+            if symbol is None:
+                self._tickers.clear()
+                self._fields.clear()
+                return
+            self._tickers.pop(symbol, None)
+            for key in [key for key in self._fields if key[0] == symbol]:
+                del self._fields[key]
+
+
+_ticker_cache = TickerCache()
+
+
+def get_ticker_cache() -> TickerCache:
+    """Process-wide TickerCache shared by YFinanceUtils and china_hk_utils."""
+    return _ticker_cache
+
+
+def warm_ticker_cache(
+    symbols: Annotated[Iterable[str], "ticker symbols"],
+    fields: Annotated[Optional[List[str]], "fields, defaults to all"] = None,
+    max_workers: Annotated[int, "parallel fetches"] = 8,
+) -> Dict[str, List[str]]:
+    """Bulk warm-up of the shared TickerCache for a symbol list."""
+    return _ticker_cache.warm(symbols, fields, max_workers)
+
 
 def init_ticker(func: Callable) -> Callable:
-    """Decorator to initialize yf.Ticker and pass it to the function."""
+    """Decorator to pass the cached ticker of a symbol to the function."""
 
     @wraps(func)
     def wrapper(symbol: Annotated[str, "ticker symbol"], *args, **kwargs) -> Any:
-        ticker = yf.Ticker(symbol)
+        ticker = _ticker_cache.wrap(symbol)
         return func(ticker, *args, **kwargs)
 
     return wrapper
@@ -17,6 +17,10 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    "parallel_analysts": False,  # run the selected analysts concurrently
     # Tool settings
     "online_tools": True,
+    "prefetch_tools": True,  # prefetch the likely tool calls when a run starts
+    "checkpoint_runs": False,  # checkpoint runs in SQLite so failed ones can resume
+    "cache_analyst_reports": False,  # reuse analyst reports made on the same inputs
 }
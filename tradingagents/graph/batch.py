@@ -0,0 +1,130 @@
+# TradingAgents/graph/batch.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Seconds to wait before the first retry of a failed job, doubled on every retry
+BATCH_RETRY_BACKOFF = 5.0
+
+
+class BatchResults:
+    """
+    Append-only JSON lines file of job results. A batch re-run with the same
+    file skips the jobs that already succeeded, so an interrupted batch resumes
+    where it stopped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[Tuple[str, str], dict]:
+        """Latest result of every job recorded so far, by (ticker, trade_date)."""
+        results = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        # a line cut short by an interrupted write
+                        continue
+                    results[(result["ticker"], result["trade_date"])] = result
+        except FileNotFoundError:
+            pass
+        return results
+
+    def append(self, result: dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(result, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+
+
+def _run_job(propagate, ticker, trade_date, retries):
+    started = time.time()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            final_state, decision = propagate(ticker, trade_date)
+            return {
+                "ticker": ticker,
+                "trade_date": trade_date,
+                "status": "ok",
+                "decision": decision,
+                "final_trade_decision": final_state["final_trade_decision"],
+                "error": None,
+                "attempts": attempts,
+                "seconds": round(time.time() - started, 1),
+            }
+        except Exception as e:
+            if attempts > retries:
+                return {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "status": "error",
+                    "decision": None,
+                    "final_trade_decision": None,
+                    "error": f"{type(e).__name__}: {e}",
+                    "attempts": attempts,
+                    "seconds": round(time.time() - started, 1),
+                }
+            time.sleep(BATCH_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def run_jobs(
+    propagate: Callable[[str, str], Tuple[Dict[str, Any], str]],
+    jobs: Iterable[Tuple[str, str]],
+    max_concurrency: int = 4,
+    retries: int = 2,
+    results_path: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Run propagate(ticker, trade_date) for every job on a bounded worker pool
+    and yield each job's result as it completes. A failing job is retried and
+    then reported with status "error" without affecting the others. With a
+    results_path, results are appended to it as they come in and jobs that
+    already succeeded there are yielded again (marked resumed) instead of run.
+    """
+    jobs = list(dict.fromkeys((ticker, str(trade_date)) for ticker, trade_date in jobs))
+    store = BatchResults(results_path) if results_path else None
+    done = store.load() if store is not None else {}
+
+    pending: List[Tuple[str, str]] = []
+    for job in jobs:
+        previous = done.get(job)
+        if previous is not None and previous["status"] == "ok":
+            yield dict(previous, resumed=True)
+        else:
+            pending.append(job)
+
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="propagate") as executor:
+        running = set()
+        for ticker, trade_date in pending:
+            # submit lazily, so a caller that stops early leaves no queued jobs behind
+            if len(running) >= max_concurrency:
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                yield from _collect(finished, store)
+            running.add(executor.submit(_run_job, propagate, ticker, trade_date, retries))
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            yield from _collect(finished, store)
+
+
+def _collect(finished, store):
+    for future in finished:
+        result = future.result()
+        if store is not None:
+            store.append(result)
+        yield dict(result, resumed=False)
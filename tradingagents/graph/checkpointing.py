@@ -0,0 +1,86 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from tradingagents.dataflows.config import get_config
+
+# Config entries that change what a run produces; runs resume only from
+# checkpoints written under the same values
+RUN_CONFIG_KEYS = [
+    "llm_provider",
+    "deep_think_llm",
+    "quick_think_llm",
+    "backend_url",
+    "max_debate_rounds",
+    "max_risk_discuss_rounds",
+    "online_tools",
+    "parallel_analysts",
+]
+
+
+def config_hash(config: Dict[str, Any], selected_analysts: List[str]) -> str:
+    """Short hash of the run-relevant config entries and the selected analysts."""
+    relevant = {key: config.get(key) for key in RUN_CONFIG_KEYS}
+    relevant["selected_analysts"] = list(selected_analysts)
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def run_thread_id(ticker: str, trade_date: str, config: Dict[str, Any], selected_analysts: List[str]) -> str:
+    """Checkpoint thread of a run, keyed by ticker, trade date and config hash."""
+    return f"{ticker}:{trade_date}:{config_hash(config, selected_analysts)}"
+
+
+class SqliteCheckpointer(SqliteSaver):
+    """
+    SQLite checkpointer usable from graph.invoke/stream as well as from
+    graph.ainvoke/astream; the async methods run the sync ones in a worker
+    thread, the saver serializes access to its connection.
+    """
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_checkpointers: Dict[str, SqliteCheckpointer] = {}
+_checkpointers_lock = threading.Lock()
+
+
+def get_checkpointer(db_path: Optional[str] = None) -> SqliteCheckpointer:
+    """Process-wide checkpointer of a database, by default under data_cache_dir."""
+    if db_path is None:
+        db_path = os.path.join(get_config()["data_cache_dir"], "checkpoints.sqlite")
+    db_path = os.path.abspath(db_path)
+    with _checkpointers_lock:
+        checkpointer = _checkpointers.get(db_path)
+        if checkpointer is None:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            checkpointer = SqliteCheckpointer(conn)
+            checkpointer.setup()
+            _checkpointers[db_path] = checkpointer
+        return checkpointer
@@ -0,0 +1,272 @@
+# TradingAgents/graph/prefetch.py
+
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.tools import StructuredTool
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.price_cache import get_online_price_cache
+from tradingagents.dataflows.price_store import get_price_store
+
+# Tool calls every analyst is known to make, as argument templates: "{ticker}"
+# stands for the ticker and {"days": n} for the trade date shifted by n days.
+# Only free sources are listed; the online analysts' paid web-search calls are
+# prefetched once the call statistics show a run is likely to make them
+DEFAULT_PREFETCH = {
+    ("fundamentals", False): [
+        ("get_finnhub_company_insider_sentiment", {"ticker": "{ticker}", "curr_date": {"days": 0}}),
+        ("get_finnhub_company_insider_transactions", {"ticker": "{ticker}", "curr_date": {"days": 0}}),
+        ("get_simfin_balance_sheet", {"ticker": "{ticker}", "freq": "quarterly", "curr_date": {"days": 0}}),
+        ("get_simfin_cashflow", {"ticker": "{ticker}", "freq": "quarterly", "curr_date": {"days": 0}}),
+        ("get_simfin_income_stmt", {"ticker": "{ticker}", "freq": "quarterly", "curr_date": {"days": 0}}),
+    ],
+    ("social", False): [
+        ("get_reddit_stock_info", {"ticker": "{ticker}", "curr_date": {"days": 0}}),
+    ],
+    ("news", False): [
+        ("get_reddit_news", {"curr_date": {"days": 0}}),
+        ("get_finnhub_news", {"ticker": "{ticker}", "start_date": {"days": -7}, "end_date": {"days": 0}}),
+    ],
+}
+
+# Share of past runs that must have made a call for it to be prefetched
+PREFETCH_MIN_SHARE = 0.5
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar(
+    "prefetch_run", default=None
+)
+
+
+def _call_key(tool_name, args):
+    return tool_name, json.dumps(args, sort_keys=True, default=str)
+
+
+def _is_date(value):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def to_template(args: Dict[str, Any], ticker: str, trade_date: str) -> Dict[str, Any]:
+    """Abstract the ticker and dates (relative to trade_date) out of tool arguments."""
+    trade_day = datetime.strptime(trade_date, "%Y-%m-%d")
+    template = {}
+    for name, value in args.items():
+        if value == ticker:
+            template[name] = "{ticker}"
+        elif _is_date(value):
+            template[name] = {"days": (datetime.strptime(value, "%Y-%m-%d") - trade_day).days}
+        else:
+            template[name] = value
+    return template
+
+
+def from_template(template: Dict[str, Any], ticker: str, trade_date: str) -> Dict[str, Any]:
+    """Tool arguments for a ticker and trade date from a template."""
+    trade_day = datetime.strptime(trade_date, "%Y-%m-%d")
+    args = {}
+    for name, value in template.items():
+        if value == "{ticker}":
+            args[name] = ticker
+        elif isinstance(value, dict) and set(value) == {"days"}:
+            args[name] = (trade_day + timedelta(days=value["days"])).strftime("%Y-%m-%d")
+        else:
+            args[name] = value
+    return args
+
+
+class ToolCallStats:
+    """Per-analyst counts of tool call templates over past runs, kept as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.runs: Dict[str, int] = data.get("runs", {})
+        self.calls: Dict[str, Dict[str, int]] = data.get("calls", {})
+
+    @staticmethod
+    def _group(analyst, online):
+        return f"{analyst}:{'online' if online else 'offline'}"
+
+    def record_run(self, analyst: str, online: bool, calls: List[Tuple[str, Dict]]):
+        """Count one run of analyst that made the given (tool, template) calls."""
+        group = self._group(analyst, online)
+        with self._lock:
+            self.runs[group] = self.runs.get(group, 0) + 1
+            counts = self.calls.setdefault(group, {})
+            for key in {json.dumps([tool, template], sort_keys=True) for tool, template in calls}:
+                counts[key] = counts.get(key, 0) + 1
+
+    def predict(
+        self, analyst: str, online: bool, min_share: float = PREFETCH_MIN_SHARE
+    ) -> List[Tuple[str, Dict]]:
+        """(tool, template) calls made in at least min_share of the past runs."""
+        group = self._group(analyst, online)
+        with self._lock:
+            runs = self.runs.get(group, 0)
+            if not runs:
+                return []
+            return [
+                tuple(json.loads(key))
+                for key, count in self.calls.get(group, {}).items()
+                if count / runs >= min_share
+            ]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        # concurrent runs save through the same temporary file
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump({"runs": self.runs, "calls": self.calls}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class PrefetchRun:
+    """Warm per-run cache of tool results, shared by prefetches and tool calls."""
+
+    def __init__(self, ticker: str, trade_date: str, analysts: List[str]):
+        self.ticker = ticker
+        self.trade_date = trade_date
+        self.analysts = list(analysts)
+        self.results: Dict[Tuple[str, str], Future] = {}
+        self.calls: Dict[str, List[Tuple[str, Dict]]] = {}
+        self.hits = 0
+        self.token: Optional[contextvars.Token] = None
+        self._lock = threading.Lock()
+
+    def claim(self, tool_name, args):
+        """(future, owner): owner is True when the caller must produce the result."""
+        key = _call_key(tool_name, args)
+        with self._lock:
+            future = self.results.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self.results[key] = future
+            return future, True
+
+    def record_call(self, analyst, tool_name, args):
+        template = to_template(args, self.ticker, self.trade_date)
+        with self._lock:
+            self.calls.setdefault(analyst, []).append((tool_name, template))
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+
+class Prefetcher:
+    """Launches the likely data fetches of a run before the analysts start."""
+
+    def __init__(self, toolkit, stats_path: Optional[str] = None, max_workers: int = 8):
+        self.toolkit = toolkit
+        self.stats = ToolCallStats(
+            stats_path
+            or os.path.join(get_config()["data_cache_dir"], "tool_call_stats.json")
+        )
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.tools: Dict[str, StructuredTool] = {}
+
+    def wrap_tool(self, analyst: str, tool: StructuredTool) -> StructuredTool:
+        """A copy of tool answering from the current run's cache when possible."""
+        self.tools[tool.name] = tool
+
+        def run_tool(**kwargs):
+            run = _current_run.get()
+            if run is None:
+                return tool.invoke(kwargs)
+            run.record_call(analyst, tool.name, kwargs)
+            future, owner = run.claim(tool.name, kwargs)
+            if not owner:
+                run.record_hit()
+                try:
+                    return future.result()
+                except Exception:
+                    # a failed prefetch is retried by the analyst's own call
+                    return tool.invoke(kwargs)
+            self._resolve(future, tool, kwargs)
+            return future.result()
+
+        return StructuredTool.from_function(
+            func=run_tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+        )
+
+    @staticmethod
+    def _resolve(future, tool, args):
+        try:
+            future.set_result(tool.invoke(args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def start(self, ticker: str, trade_date: str, analysts: List[str], online: bool) -> PrefetchRun:
+        """
+        Create the run's cache, launch the prefetches and make the run current
+        in this context until detach(run) is called.
+        """
+        trade_date = str(trade_date)
+        run = PrefetchRun(ticker, trade_date, analysts)
+
+        if "market" in analysts:
+            self.executor.submit(self._warm_prices, ticker, online)
+
+        for analyst in analysts:
+            predicted = list(DEFAULT_PREFETCH.get((analyst, online), []))
+            predicted += [
+                call for call in self.stats.predict(analyst, online) if call not in predicted
+            ]
+            for tool_name, template in predicted:
+                tool = self.tools.get(tool_name) or getattr(self.toolkit, tool_name, None)
+                if tool is None:
+                    continue
+                args = from_template(template, ticker, trade_date)
+                future, owner = run.claim(tool_name, args)
+                if owner:
+                    self.executor.submit(self._resolve, future, tool, args)
+
+        run.token = _current_run.set(run)
+        return run
+
+    @staticmethod
+    def _warm_prices(ticker, online):
+        # indicator and price tools take arbitrary windows, warm the history they slice
+        try:
+            if online:
+                get_online_price_cache().get(ticker)
+            else:
+                price_dir = os.path.join(get_config()["data_dir"], "market_data", "price_data")
+                get_price_store(price_dir).table(ticker)
+        except Exception as e:
+            print(f"Price prefetch for {ticker} failed: {e}")
+
+    @staticmethod
+    def detach(run: PrefetchRun):
+        """Restore the run that was current before start(), in the context start() ran in."""
+        if run.token is not None:
+            _current_run.reset(run.token)
+            run.token = None
+
+    def finish(self, run: PrefetchRun, analysts: List[str], online: bool):
+        """Learn from the tool calls of a completed run."""
+        for analyst in analysts:
+            self.stats.record_run(analyst, online, run.calls.get(analyst, []))
+        try:
+            self.stats.save()
+        except OSError as e:
+            print(f"Could not save tool call statistics: {e}")
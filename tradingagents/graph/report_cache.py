@@ -0,0 +1,210 @@
+# TradingAgents/graph/report_cache.py
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Annotated, Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents import (
+    create_fundamentals_analyst,
+    create_market_analyst,
+    create_news_analyst,
+    create_social_media_analyst,
+)
+from tradingagents.dataflows.config import get_config
+
+# Bump to drop every cached report, e.g. after a change to the tools' output
+REPORT_CACHE_VERSION = 1
+# Config entries an analyst report depends on besides ticker and trade date
+REPORT_CONFIG_KEYS = ["llm_provider", "quick_think_llm", "backend_url", "online_tools"]
+# Reports on trade dates this close to today are redone after REPORT_CACHE_TTL_RECENT
+# seconds, as the data behind them is still coming in
+REPORT_CACHE_RECENT_DAYS = 1
+REPORT_CACHE_TTL_RECENT = 3600
+
+# Functions holding each analyst's prompt, their source is the prompt version
+_ANALYST_PROMPTS = {
+    "market": create_market_analyst,
+    "social": create_social_media_analyst,
+    "news": create_news_analyst,
+    "fundamentals": create_fundamentals_analyst,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_version(analyst: str) -> str:
+    """Hash of the analyst's prompt code, so editing a prompt invalidates its reports."""
+    try:
+        source = inspect.getsource(_ANALYST_PROMPTS[analyst])
+    except (OSError, TypeError):
+        source = analyst
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+def report_fingerprint(
+    analyst: Annotated[str, "analyst type, e.g. market"],
+    ticker: Annotated[str, "ticker symbol"],
+    trade_date: Annotated[str, "trade date, yyyy-mm-dd"],
+    config: Annotated[Dict[str, Any], "run configuration"],
+) -> str:
+    """Key of an analyst report: ticker, date, model, tool mode and prompt version."""
+    payload = {key: config.get(key) for key in REPORT_CONFIG_KEYS}
+    payload.update(
+        analyst=analyst,
+        ticker=ticker,
+        trade_date=str(trade_date),
+        prompt_version=prompt_version(analyst),
+        cache_version=REPORT_CACHE_VERSION,
+    )
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class ReportCache:
+    """SQLite-backed fingerprint -> analyst report cache."""
+
+    def __init__(self, db_path: Annotated[str, "path of the SQLite database"]):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                "fingerprint TEXT PRIMARY KEY, analyst TEXT, ticker TEXT, "
+                "trade_date TEXT, report TEXT, created REAL, expires REAL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, fingerprint: Annotated[str, "report fingerprint"]) -> Optional[str]:
+        """The cached report, or None when missing or expired."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT report FROM reports WHERE fingerprint = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (fingerprint, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self,
+        fingerprint: Annotated[str, "report fingerprint"],
+        analyst: Annotated[str, "analyst type"],
+        ticker: Annotated[str, "ticker symbol"],
+        trade_date: Annotated[str, "trade date, yyyy-mm-dd"],
+        report: Annotated[str, "final report text"],
+    ):
+        now = time.time()
+        ttl = self.ttl(trade_date)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, analyst, ticker, str(trade_date), report, now,
+                 None if ttl is None else now + ttl),
+            )
+
+    @staticmethod
+    def ttl(trade_date):
+        """Seconds a report stays valid, None for settled trade dates."""
+        try:
+            age = (date.today() - datetime.strptime(str(trade_date), "%Y-%m-%d").date()).days
+        except ValueError:
+            return REPORT_CACHE_TTL_RECENT
+        if age <= REPORT_CACHE_RECENT_DAYS:
+            return REPORT_CACHE_TTL_RECENT
+        return None
+
+    def invalidate(
+        self,
+        ticker: Annotated[Optional[str], "only this ticker"] = None,
+        trade_date: Annotated[Optional[str], "only this trade date"] = None,
+        analysts: Annotated[Optional[List[str]], "only these analysts"] = None,
+    ) -> int:
+        """Drop the matching reports, every report without filters; returns the count."""
+        clauses, params = [], []
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if trade_date is not None:
+            clauses.append("trade_date = ?")
+            params.append(str(trade_date))
+        if analysts is not None:
+            clauses.append(f"analyst IN ({','.join('?' * len(analysts))})")
+            params.extend(analysts)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock, self._connect() as conn:
+            return conn.execute(f"DELETE FROM reports{where}", params).rowcount
+
+
+def create_cached_analyst(
+    analyst_node,
+    analyst: Annotated[str, "analyst type"],
+    report_field: Annotated[str, "state field of the report"],
+    cache: ReportCache,
+    run_config: Annotated[Dict[str, Any], "run configuration"],
+):
+    """
+    Wrap an analyst node so a cached report is answered at once, as a final
+    message without tool calls that routes the analyst straight to its Msg
+    Clear node. Finished reports are stored for later runs.
+    """
+
+    def lookup(state):
+        fingerprint = report_fingerprint(
+            analyst, state["company_of_interest"], state["trade_date"], run_config
+        )
+        return fingerprint, cache.get(fingerprint)
+
+    def store(state, fingerprint, result):
+        report = result.get(report_field)
+        # the analyst is done once it answers without calling tools
+        if report and not result["messages"][-1].tool_calls:
+            cache.put(
+                fingerprint, analyst, state["company_of_interest"], state["trade_date"], report
+            )
+
+    def cached_analyst_node(state, config):
+        fingerprint, report = lookup(state)
+        if report is not None:
+            return {"messages": [AIMessage(content=report)], report_field: report}
+        result = analyst_node.invoke(state, config)
+        store(state, fingerprint, result)
+        return result
+
+    async def acached_analyst_node(state, config):
+        fingerprint, report = lookup(state)
+        if report is not None:
+            return {"messages": [AIMessage(content=report)], report_field: report}
+        result = await analyst_node.ainvoke(state, config)
+        store(state, fingerprint, result)
+        return result
+
+    return RunnableLambda(cached_analyst_node, afunc=acached_analyst_node)
+
+
+_caches: Dict[str, ReportCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Process-wide ReportCache in the configured data_cache_dir."""
+    db_path = os.path.abspath(
+        os.path.join(get_config()["data_cache_dir"], "analyst_reports.sqlite")
+    )
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = ReportCache(db_path)
+            _caches[db_path] = cache
+        return cache
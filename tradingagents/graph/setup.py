@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -10,6 +11,15 @@ from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
+from .report_cache import ReportCache, create_cached_analyst
+
+# State field each analyst writes its report to
+ANALYST_REPORTS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
 
 
 class GraphSetup:
@@ -27,6 +37,7 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        report_cache: Optional[ReportCache] = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -39,9 +50,13 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.report_cache = report_cache
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +66,11 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently, each in its
+                own branch with a private message history, joining before the
+                Bull Researcher. By default they run one after another.
+            checkpointer: Optional checkpointer saving the state after every
+                step, which lets failed runs resume.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -88,6 +108,17 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # Answer analysts from earlier reports on the same inputs
+        if self.report_cache is not None:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_nodes[analyst_type] = create_cached_analyst(
+                    node,
+                    analyst_type,
+                    ANALYST_REPORTS[analyst_type],
+                    self.report_cache,
+                    self.toolkit.config,
+                )
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
             self.quick_thinking_llm, self.bull_memory
@@ -111,13 +142,14 @@ class GraphSetup:
         # Create workflow
         workflow = StateGraph(AgentState)
 
-        # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+        if parallel_analysts:
+            analysts_done = self._add_parallel_analysts(
+                workflow, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
+            )
+        else:
+            analysts_done = self._add_sequential_analysts(
+                workflow, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -129,33 +161,8 @@ class GraphSetup:
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
-        # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
-
         # Add remaining edges
+        workflow.add_edge(analysts_done, "Bull Researcher")
         workflow.add_conditional_edges(
             "Bull Researcher",
             self.conditional_logic.should_continue_debate,
@@ -202,4 +209,83 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _add_analyst_loop(self, workflow, analyst_type, analyst_node, delete_node, tool_node):
+        """Add an analyst with its tool loop; returns its entry and exit nodes."""
+        current_analyst = f"{analyst_type.capitalize()} Analyst"
+        current_tools = f"tools_{analyst_type}"
+        current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+        workflow.add_node(current_analyst, analyst_node)
+        workflow.add_node(current_clear, delete_node)
+        workflow.add_node(current_tools, tool_node)
+
+        # Add conditional edges for current analyst
+        workflow.add_conditional_edges(
+            current_analyst,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            [current_tools, current_clear],
+        )
+        workflow.add_edge(current_tools, current_analyst)
+        return current_analyst, current_clear
+
+    def _add_sequential_analysts(
+        self, workflow, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
+    ):
+        """Chain the analysts one after another; returns the last node."""
+        previous_clear = START
+        for analyst_type in selected_analysts:
+            current_analyst, current_clear = self._add_analyst_loop(
+                workflow,
+                analyst_type,
+                analyst_nodes[analyst_type],
+                delete_nodes[analyst_type],
+                tool_nodes[analyst_type],
+            )
+            # Connect to the previous analyst (or the start)
+            workflow.add_edge(previous_clear, current_analyst)
+            previous_clear = current_clear
+        return previous_clear
+
+    def _add_parallel_analysts(
+        self, workflow, selected_analysts, analyst_nodes, delete_nodes, tool_nodes
+    ):
+        """Fan the analysts out into parallel branches; returns the branch nodes."""
+        branches = []
+        for analyst_type in selected_analysts:
+            # Each branch runs its tool loop in a subgraph of its own, so the
+            # analysts' conversations never mix in the shared message channel
+            branch = StateGraph(AgentState)
+            current_analyst, current_clear = self._add_analyst_loop(
+                branch,
+                analyst_type,
+                analyst_nodes[analyst_type],
+                delete_nodes[analyst_type],
+                tool_nodes[analyst_type],
+            )
+            branch.add_edge(START, current_analyst)
+            branch.add_edge(current_clear, END)
+
+            name = f"{analyst_type.capitalize()} Branch"
+            workflow.add_node(
+                name, self._create_branch_node(branch.compile(), ANALYST_REPORTS[analyst_type])
+            )
+            workflow.add_edge(START, name)
+            branches.append(name)
+
+        # joining on all of them makes the Bull Researcher wait for every branch
+        return branches
+
+    @staticmethod
+    def _create_branch_node(branch_graph, report_field):
+        # only the report leaves the branch, its messages stay private
+        def branch_node(state, config):
+            result = branch_graph.invoke(state, config)
+            return {report_field: result[report_field]}
+
+        async def abranch_node(state, config):
+            result = await branch_graph.ainvoke(state, config)
+            return {report_field: result[report_field]}
+
+        return RunnableLambda(branch_node, afunc=abranch_node)
@@ -1,10 +1,12 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
 import os
+import threading
 from pathlib import Path
 import json
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Iterable, Iterator, Tuple, List, Optional
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -21,12 +23,17 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.openai_clients import get_http_client
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .prefetch import Prefetcher
+from .batch import run_jobs
+from .checkpointing import get_checkpointer, run_thread_id
+from .report_cache import get_report_cache, report_fingerprint
 
 
 class TradingAgentsGraph:
@@ -60,14 +67,17 @@ class TradingAgentsGraph:
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter" or self.config["llm_provider"].lower() == "deepseek":
             # 为DeepSeek添加SSL配置
-            extra_kwargs = {}
             if self.config["llm_provider"].lower() == "deepseek":
-                import ssl
-                extra_kwargs["http_client"] = None  # 使用默认的httpx客户端
                 # 清除SSL_CERT_FILE环境变量以避免权限问题
                 if "SSL_CERT_FILE" in os.environ:
                     del os.environ["SSL_CERT_FILE"]
-            
+
+            # both models share the pooled keep-alive connections of the backend;
+            # the async client is left to each model as it is bound to an event loop
+            extra_kwargs = {
+                "http_client": get_http_client(self.config["backend_url"]),
+            }
+
             self.deep_thinking_llm = ChatOpenAI(
                 model=self.config["deep_think_llm"], 
                 base_url=self.config["backend_url"],
@@ -96,6 +106,22 @@ class TradingAgentsGraph:
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
+        # Prefetch the likely tool calls of each run
+        self.selected_analysts = list(selected_analysts)
+        self.prefetcher = (
+            Prefetcher(self.toolkit) if self.config.get("prefetch_tools", True) else None
+        )
+
+        # Checkpoint every step of a run so a failed run can resume
+        self.checkpointer = (
+            get_checkpointer() if self.config.get("checkpoint_runs", False) else None
+        )
+
+        # Reuse the analyst reports of earlier runs on the same inputs
+        self.report_cache = (
+            get_report_cache() if self.config.get("cache_analyst_reports", False) else None
+        )
+
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
@@ -112,103 +138,255 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self.report_cache,
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
 
-        # State tracking
-        self.curr_state = None
-        self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        # State tracking; runs may be concurrent, so the latest run's ticker
+        # and state are kept per calling thread
+        self._run_local = threading.local()
+        self.log_states_dict = {}  # (ticker, date) to full state dict
+        self._log_lock = threading.Lock()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            self.config.get("parallel_analysts", False),
+            self.checkpointer,
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
+        tools = self._tool_lists()
+        if self.prefetcher is not None:
+            # tool calls answer from the run's prefetch cache
+            tools = {
+                analyst: [self.prefetcher.wrap_tool(analyst, tool) for tool in analyst_tools]
+                for analyst, analyst_tools in tools.items()
+            }
+        return {analyst: ToolNode(analyst_tools) for analyst, analyst_tools in tools.items()}
+
+    def _tool_lists(self) -> Dict[str, List]:
+        """Tools of each analyst's tool node."""
         return {
-            "market": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_YFin_data_online,
-                    self.toolkit.get_stockstats_indicators_report_online,
-                    # offline tools
-                    self.toolkit.get_YFin_data,
-                    self.toolkit.get_stockstats_indicators_report,
-                ]
-            ),
-            "social": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_stock_news_openai,
-                    # offline tools
-                    self.toolkit.get_reddit_stock_info,
-                ]
-            ),
-            "news": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_global_news_openai,
-                    self.toolkit.get_google_news,
-                    # offline tools
-                    self.toolkit.get_finnhub_news,
-                    self.toolkit.get_reddit_news,
-                ]
-            ),
-            "fundamentals": ToolNode(
-                [
-                    # online tools
-                    self.toolkit.get_fundamentals_openai,
-                    # offline tools
-                    self.toolkit.get_finnhub_company_insider_sentiment,
-                    self.toolkit.get_finnhub_company_insider_transactions,
-                    self.toolkit.get_simfin_balance_sheet,
-                    self.toolkit.get_simfin_cashflow,
-                    self.toolkit.get_simfin_income_stmt,
-                ]
-            ),
+            "market": [
+                # online tools
+                self.toolkit.get_YFin_data_online,
+                self.toolkit.get_stockstats_indicators_report_online,
+                self.toolkit.get_stockstats_indicators_table_online,
+                # offline tools
+                self.toolkit.get_YFin_data,
+                self.toolkit.get_stockstats_indicators_report,
+                self.toolkit.get_stockstats_indicators_table,
+            ],
+            "social": [
+                # online tools
+                self.toolkit.get_stock_news_openai,
+                # offline tools
+                self.toolkit.get_reddit_stock_info,
+            ],
+            "news": [
+                # online tools
+                self.toolkit.get_global_news_openai,
+                self.toolkit.get_google_news,
+                # offline tools
+                self.toolkit.get_finnhub_news,
+                self.toolkit.get_reddit_news,
+            ],
+            "fundamentals": [
+                # online tools
+                self.toolkit.get_fundamentals_openai,
+                # offline tools
+                self.toolkit.get_finnhub_company_insider_sentiment,
+                self.toolkit.get_finnhub_company_insider_transactions,
+                self.toolkit.get_simfin_balance_sheet,
+                self.toolkit.get_simfin_cashflow,
+                self.toolkit.get_simfin_income_stmt,
+            ],
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, resume=True):
+        """Run the trading agents graph for a company on a specific date.
+
+        With checkpointing on and resume set, an earlier run of the same
+        company, date and config that failed or was interrupted continues from
+        its last completed node instead of starting over.
+        """
+        prefetch_run, init_agent_state, args = self._start_run(
+            company_name, trade_date, resume
+        )
+
+        try:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+        finally:
+            self._detach_run(prefetch_run)
+
+        self._finish_run(prefetch_run, trade_date, final_state)
+        self._run_local.curr_state = final_state
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    async def apropagate(self, company_name, trade_date, resume=True):
+        """
+        Async version of propagate: the agents call their LLMs with ainvoke, so
+        many analyses can run concurrently on one event loop.
+        """
+        # started in this task's context, which the prefetches are attached to
+        prefetch_run, init_agent_state, args = self._start_run(
+            company_name, trade_date, resume
+        )
+
+        try:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                async for chunk in self.graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
+        finally:
+            # in the task's context, where the run was made current
+            self._detach_run(prefetch_run)
+
+        # bookkeeping writes files, keep it off the event loop
+        await asyncio.to_thread(self._finish_run, prefetch_run, trade_date, final_state)
+        self._run_local.curr_state = final_state
 
-        self.ticker = company_name
+        # Return decision and processed signal
+        return final_state, await self.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+
+    def propagate_many(
+        self,
+        jobs: Iterable[Tuple[str, str]],
+        max_concurrency: int = 4,
+        retries: int = 2,
+        results_path: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run propagate for many (ticker, trade_date) jobs concurrently on this
+        graph, sharing its LLM clients and memories.
+
+        Yields one result dict per job as it completes: ticker, trade_date,
+        status ("ok" or "error"), decision, final_trade_decision, error,
+        attempts, seconds and resumed. Failed jobs are retried up to retries
+        times. When results_path is given, results are appended to it as JSON
+        lines and a re-run skips the jobs that already succeeded there.
+        """
+        return run_jobs(self.propagate, jobs, max_concurrency, retries, results_path)
+
+    def run_thread_id(self, company_name, trade_date):
+        """Checkpoint thread of a run, keyed by company, date and config hash."""
+        return run_thread_id(
+            company_name, str(trade_date), self.config, self.selected_analysts
+        )
+
+    def has_checkpoint(self, company_name, trade_date):
+        """Whether an unfinished run of the company and date can be resumed."""
+        if self.checkpointer is None:
+            return False
+        args = self.propagator.get_graph_args(self.run_thread_id(company_name, trade_date))
+        return bool(self.graph.get_state(args["config"]).next)
+
+    def run_inputs(self, company_name, trade_date, resume=True):
+        """
+        Graph input and arguments of a run. The input is None when the run
+        resumes from its checkpoint; a fresh run drops any earlier checkpoint.
+        """
+        if self.checkpointer is None:
+            args = self.propagator.get_graph_args()
+        else:
+            thread_id = self.run_thread_id(company_name, trade_date)
+            args = self.propagator.get_graph_args(thread_id)
+            if resume and self.has_checkpoint(company_name, trade_date):
+                return None, args
+            self.checkpointer.delete_thread(thread_id)
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        return init_agent_state, args
+
+    def cached_reports(self, company_name, trade_date):
+        """Analyst reports of the company and date a run would take from the cache."""
+        if self.report_cache is None:
+            return {}
+        reports = {}
+        for analyst in self.selected_analysts:
+            report = self.report_cache.get(
+                # the toolkit's config is the one the analyst nodes are keyed by
+                report_fingerprint(analyst, company_name, str(trade_date), self.toolkit.config)
+            )
+            if report is not None:
+                reports[analyst] = report
+        return reports
+
+    def invalidate_reports(self, company_name=None, trade_date=None, analysts=None):
+        """Drop cached analyst reports, optionally of one company, date or analysts only."""
+        if self.report_cache is None:
+            return 0
+        return self.report_cache.invalidate(company_name, trade_date, analysts)
+
+    def _start_run(self, company_name, trade_date, resume=True):
+        """Build the graph input and arguments and start the prefetches."""
+        self._run_local.ticker = company_name
+        init_agent_state, args = self.run_inputs(company_name, trade_date, resume)
+
+        # Launch the likely data fetches before the analysts ask for them; a
+        # resumed run has made most of its calls already and cached reports need none
+        prefetch_run = None
+        if self.prefetcher is not None and init_agent_state is not None:
+            cached = self.cached_reports(company_name, trade_date)
+            prefetch_run = self.prefetcher.start(
+                company_name,
+                trade_date,
+                [analyst for analyst in self.selected_analysts if analyst not in cached],
+                self.config["online_tools"],
+            )
+        return prefetch_run, init_agent_state, args
 
-        # Store current state for reflection
-        self.curr_state = final_state
+    def _detach_run(self, prefetch_run):
+        if prefetch_run is not None:
+            self.prefetcher.detach(prefetch_run)
 
-        # Log state
-        self._log_state(trade_date, final_state)
+    def _finish_run(self, prefetch_run, trade_date, final_state):
+        if prefetch_run is not None:
+            self.prefetcher.finish(
+                prefetch_run, prefetch_run.analysts, self.config["online_tools"]
+            )
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        self._log_state(trade_date, final_state)
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = final_state["company_of_interest"]
+        log_state = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -237,35 +415,57 @@ class TradingAgentsGraph:
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
         }
+        with self._log_lock:
+            self.log_states_dict[(ticker, str(trade_date))] = log_state
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        # Save to file, holding this run's state only
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            json.dump({str(trade_date): log_state}, f, indent=4)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
+    @property
+    def curr_state(self):
+        """Final state of the latest run started from the calling thread."""
+        return getattr(self._run_local, "curr_state", None)
+
+    @property
+    def ticker(self):
+        """Ticker of the latest run started from the calling thread."""
+        return getattr(self._run_local, "ticker", None)
+
+    def reflect_and_remember(self, returns_losses, final_state=None):
+        """
+        Reflect on decisions and update memory based on returns. final_state is
+        the state a propagate call returned, by default that of the latest run
+        from the calling thread; pass it when runs are concurrent.
+        """
+        if final_state is None:
+            final_state = self.curr_state
         self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
+            final_state, returns_losses, self.bull_memory
         )
         self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
+            final_state, returns_losses, self.bear_memory
         )
         self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
+            final_state, returns_losses, self.trader_memory
         )
         self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+            final_state, returns_losses, self.invest_judge_memory
         )
         self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+            final_state, returns_losses, self.risk_manager_memory
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)
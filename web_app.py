@@ -190,6 +190,14 @@ with st.sidebar:
         deep_model = st.selectbox("🧠 深度思维模型", thinking_models, index=0)
         quick_model = st.selectbox("⚡ 快速思维模型", thinking_models, index=0)
 
+    # 断点续跑
+    st.subheader("💾 断点续跑")
+    resume_run = st.checkbox(
+        "从上次中断处继续",
+        value=False,
+        help="相同股票、日期和配置的分析若中途失败，将从最后完成的步骤继续，而不是重新开始"
+    )
+
 # 主内容区域
 if st.button("🚀 开始分析", type="primary", use_container_width=True):
     if not selected_analysts:
@@ -204,7 +212,9 @@ if st.button("🚀 开始分析", type="primary", use_container_width=True):
         "deep_think_llm": deep_model,
         "quick_think_llm": quick_model,
         "max_debate_rounds": research_depth,
-        "max_risk_discuss_rounds": research_depth
+        "max_risk_discuss_rounds": research_depth,
+        # 记录断点，中途失败的分析可勾选“从上次中断处继续”
+        "checkpoint_runs": True,
     })
     
     # 显示配置信息
@@ -240,23 +250,12 @@ if st.button("🚀 开始分析", type="primary", use_container_width=True):
         status_text.markdown('<p class="status-warning">📊 准备分析状态...</p>', unsafe_allow_html=True)
         progress_bar.progress(20)
         
-        init_state = {
-            "messages": [("human", ticker)],
-            "company_of_interest": ticker,
-            "trade_date": analysis_date.strftime("%Y-%m-%d"),
-            "investment_debate_state": {"history": "", "current_response": "", "count": 0},
-            "risk_debate_state": {
-                "history": "", 
-                "current_risky_response": "", 
-                "current_safe_response": "", 
-                "current_neutral_response": "", 
-                "count": 0
-            },
-            "market_report": "",
-            "fundamentals_report": "",
-            "sentiment_report": "",
-            "news_report": ""
-        }
+        # 有未完成的同配置分析时从断点继续（init_state 为 None）
+        init_state, graph_args = graph.run_inputs(
+            ticker, analysis_date.strftime("%Y-%m-%d"), resume=resume_run
+        )
+        if init_state is None:
+            st.info("♻️ 检测到未完成的分析，将从上次的断点继续")
         
         # 执行分析并收集所有结果
         status_text.markdown('<p class="status-warning">🚀 正在执行多智能体分析...</p>', unsafe_allow_html=True)
@@ -275,11 +274,7 @@ if st.button("🚀 开始分析", type="primary", use_container_width=True):
         total_steps = len(selected_analysts) * research_depth + 5
         
         # 流式处理分析结果（只更新进度，不更新UI）
-        for chunk in graph.graph.stream(
-            init_state, 
-            config={"recursion_limit": 100},
-            stream_mode="values"
-        ):
+        for chunk in graph.graph.stream(init_state, **graph_args):
             step_count += 1
             progress = min(30 + (step_count / total_steps) * 60, 90)
             progress_bar.progress(int(progress))